@@ -1,12 +1,11 @@
 import json
+import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from django.contrib.auth import get_user_model
-from asgiref.sync import sync_to_async
-from .models import Message, MessageGroup
-from .serializers import MessageSerializer
+from .models import Message
+from .serializers import MessageListSerializer
 
-User = get_user_model()
+logger = logging.getLogger(__name__)
 
 class ChatConsumer(AsyncWebsocketConsumer):
     async def connect(self):
@@ -37,17 +36,11 @@ class ChatConsumer(AsyncWebsocketConsumer):
             data = json.loads(text_data)
             # Handle typing indicator messages
             if data.get('type') == 'typing':
-                await self.channel_layer.group_send(
-                    self.room_group_name,
-                    {
-                        'type': 'chat_message',
-                        'message': {
-                            'type': 'typing',
-                            'typing': data.get('typing', False),
-                            'user_id': self.scope["user"].id
-                        }
-                    }
-                )
+                await self.broadcast({
+                    'type': 'typing',
+                    'typing': data.get('typing', False),
+                    'user_id': self.scope["user"].id
+                })
                 return
 
             # Get message content from different possible keys
@@ -55,44 +48,48 @@ class ChatConsumer(AsyncWebsocketConsumer):
             
             # Validate content is not empty
             if not message_content or not isinstance(message_content, str) or message_content.strip() == '':
-                print(f"Invalid message content: {data}")
+                logger.debug("Invalid message content: %s", data)
                 return
                 
             group_id = data.get('group_id')
             recipient_id = data.get('recipient_id')  # Optional, for DMs
 
-            # Save message to DB using authenticated user as sender
-            msg_obj = await self.save_message(recipient_id, group_id, message_content)
-            serialized = await sync_to_async(lambda obj: MessageSerializer(obj).data)(msg_obj)
+            # Save and serialize the message in one sync thread hop
+            serialized = await self.save_message(recipient_id, group_id, message_content)
 
-            await self.channel_layer.group_send(
-                self.room_group_name,
-                {
-                    'type': 'chat_message',
-                    'message': serialized
-                }
-            )
+            await self.broadcast(serialized)
         except Exception as e:
-            print(f"Error processing message: {str(e)}")
-            print(f"Message data: {text_data}")
+            logger.error("Error processing message: %s", e)
+            logger.debug("Message data: %s", text_data)
             # Don't propagate the exception to prevent connection drops
 
+    async def broadcast(self, payload):
+        # Encode once here; every subscriber then forwards the same string
+        await self.channel_layer.group_send(
+            self.room_group_name,
+            {
+                'type': 'chat_message',
+                'text': json.dumps(payload, separators=(',', ':'))
+            }
+        )
+
     async def chat_message(self, event):
-        await self.send(text_data=json.dumps(event['message']))
+        await self.send(text_data=event['text'])
 
     @database_sync_to_async
     def save_message(self, recipient_id, group_id, content):
         if not content:
             raise ValueError("Message content cannot be empty")
             
-        user_obj = self.scope["user"]
-        sender = User.objects.get(pk=user_obj.pk)
-        recipient = User.objects.get(id=recipient_id) if recipient_id else None
-        group = MessageGroup.objects.get(id=group_id) if group_id else None
-        
-        return Message.objects.create(
-            sender=sender, 
-            recipient=recipient, 
-            group=group, 
+        # The scope user already carries the columns the serializer renders,
+        # so the sender needs no further lookup; other FKs are assigned by id
+        # and the database rejects unknown recipients or groups
+        msg = Message.objects.create(
+            sender=self.scope["user"],
+            recipient_id=recipient_id or None,
+            group_id=group_id or None,
             content=content.strip()  # Ensure no leading/trailing whitespace
         )
+        
+        # Serialize here so the recipient lookup doesn't block the event loop later
+        return MessageListSerializer(msg).data
@@ -1,26 +1,99 @@
+import time
+from collections import OrderedDict
 from urllib.parse import parse_qs
+import jwt
 from channels.middleware import BaseMiddleware
 from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import AccessToken
 from users.models import User
 import logging
 
 logger = logging.getLogger("channels.auth")
 
+# Resolved users are kept per token jti for at most this many seconds
+USER_CACHE_TTL = 300
+USER_CACHE_MAXSIZE = 10_000
+
+
+class TokenUserCache:
+    """Small in-process LRU of token jti -> (user, expires_at)"""
+
+    def __init__(self, maxsize=USER_CACHE_MAXSIZE):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+
+    def get(self, jti):
+        entry = self._entries.get(jti)
+        if entry is None:
+            return None
+        user, expires_at = entry
+        if expires_at <= time.time():
+            del self._entries[jti]
+            return None
+        self._entries.move_to_end(jti)
+        return user
+
+    def set(self, jti, user, token_exp):
+        # Never keep a user around longer than the token itself is valid
+        expires_at = min(time.time() + USER_CACHE_TTL, token_exp)
+        self._entries[jti] = (user, expires_at)
+        self._entries.move_to_end(jti)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+token_user_cache = TokenUserCache()
+
+
+def decode_access_token(token):
+    """
+    Validate an access token and return its claims.
+    HMAC-signed tokens are checked with a direct PyJWT decode; anything the
+    fast path rejects goes through simplejwt's AccessToken for the full checks.
+    """
+    if api_settings.ALGORITHM.startswith('HS'):
+        try:
+            claims = jwt.decode(
+                token,
+                api_settings.SIGNING_KEY,
+                algorithms=[api_settings.ALGORITHM],
+                audience=api_settings.AUDIENCE,
+                issuer=api_settings.ISSUER,
+                leeway=api_settings.LEEWAY,
+                options={'require': ['exp', api_settings.USER_ID_CLAIM, api_settings.JTI_CLAIM]},
+            )
+            if claims.get(api_settings.TOKEN_TYPE_CLAIM) == AccessToken.token_type:
+                return claims
+        except jwt.PyJWTError:
+            pass
+    return AccessToken(token).payload
+
+
 class JWTAuthMiddleware(BaseMiddleware):
     async def __call__(self, scope, receive, send):
         query_string = scope.get("query_string", b"").decode()
         query_params = parse_qs(query_string)
         token = query_params.get("token", [None])[0]
         user = AnonymousUser()
-        logger.info(f"[JWTAuthMiddleware] Token: {token}")
         if token:
             try:
-                validated_token = AccessToken(token)
-                user_id = validated_token.get("user_id")
-                logger.info(f"[JWTAuthMiddleware] user_id from token: {user_id}")
-                user = await User.objects.aget(id=user_id)
-                logger.info(f"[JWTAuthMiddleware] User found: {user}")
+                validated_token = decode_access_token(token)
+                jti = validated_token.get(api_settings.JTI_CLAIM)
+                cached_user = token_user_cache.get(jti) if jti else None
+                if cached_user is not None:
+                    user = cached_user
+                else:
+                    user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+                    # Enough columns for auth checks and for rendering the
+                    # user as a message sender in ChatConsumer
+                    user = await User.objects.only(
+                        'id', 'username', 'first_name', 'last_name', 'email', 'is_active'
+                    ).aget(id=user_id)
+                    if jti:
+                        token_user_cache.set(jti, user, validated_token["exp"])
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("[JWTAuthMiddleware] Authenticated user %s", user.id)
             except Exception as e:
                 logger.error(f"[JWTAuthMiddleware] Exception: {e}")
         scope["user"] = user
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_messagegroup_message'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['group', 'created_at'], name='api_message_group_i_ac7f96_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['sender', 'recipient', 'created_at'], name='api_message_sender__af51b6_idx'),
+        ),
+    ]
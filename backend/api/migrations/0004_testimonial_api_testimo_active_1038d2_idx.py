@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 17:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_message_api_message_group_i_ac7f96_idx_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='testimonial',
+            index=models.Index(fields=['active', '-created_at'], name='api_testimo_active_1038d2_idx'),
+        ),
+    ]
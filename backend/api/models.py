@@ -20,6 +20,10 @@ class Testimonial(models.Model):
         ordering = ['-created_at']
         verbose_name = "Testimonial"
         verbose_name_plural = "Testimonials"
+        indexes = [
+            # Backs the active-only keyset pagination on created_at
+            models.Index(fields=['active', '-created_at']),
+        ]
 
 class MessageGroup(models.Model):
     """A group chat for multiple users"""
@@ -48,4 +52,10 @@ class Message(models.Model):
         return f"{self.sender} -> {self.recipient}: {self.content[:20]}"
 
     class Meta:
-        ordering = ['-created_at']
\ No newline at end of file
+        ordering = ['-created_at']
+        indexes = [
+            # Group history is read in created_at order
+            models.Index(fields=['group', 'created_at']),
+            # Inbox scans between two users
+            models.Index(fields=['sender', 'recipient', 'created_at']),
+        ]
\ No newline at end of file
@@ -16,10 +16,18 @@ class TestimonialSerializer(serializers.ModelSerializer):
         """Get the absolute URL for the image"""
         if not obj.image:
             return None
-            
-        # Make sure the URL works both from browser and within containers
-        # The frontend will handle URL conversion if needed
-        return f"http://localhost:8000{obj.image.url}"
+        
+        url = obj.image.url
+        # Remote storages already return absolute URLs
+        if url.startswith(('http://', 'https://')):
+            return url
+        
+        # The view resolves the host prefix once per request rather than per row
+        base_url = self.context.get('media_base_url')
+        if base_url is None:
+            request = self.context.get('request')
+            return request.build_absolute_uri(url) if request else url
+        return f"{base_url}{url}"
     
     class Meta:
         model = Testimonial
@@ -33,9 +41,19 @@ class UserShortSerializer(serializers.ModelSerializer):
 
 class MessageGroupSerializer(serializers.ModelSerializer):
     members = UserShortSerializer(many=True, read_only=True)
+    member_ids = serializers.ListField(child=serializers.IntegerField(), write_only=True, required=False)
     class Meta:
         model = MessageGroup
-        fields = ["id", "name", "members", "created_at", "updated_at"]
+        fields = ["id", "name", "members", "member_ids", "created_at", "updated_at"]
+
+    def validate_member_ids(self, value):
+        """Check all initial members exist with a single query"""
+        ids = set(value)
+        found = set(User.objects.filter(id__in=ids).values_list('id', flat=True))
+        missing = ids - found
+        if missing:
+            raise serializers.ValidationError(f"Users not found: {sorted(missing)}")
+        return list(ids)
 
 class MessageSerializer(serializers.ModelSerializer):
     sender = UserShortSerializer(read_only=True)
@@ -44,4 +62,8 @@ class MessageSerializer(serializers.ModelSerializer):
     group = MessageGroupSerializer(read_only=True)
     class Meta:
         model = Message
-        fields = ["id", "sender", "recipient", "group_id", "group", "content", "created_at", "read"]
\ No newline at end of file
+        fields = ["id", "sender", "recipient", "group_id", "group", "content", "created_at", "read"]
+
+class MessageListSerializer(MessageSerializer):
+    """Lean message representation for lists and websocket fan-out; the group is just its id"""
+    group = serializers.PrimaryKeyRelatedField(read_only=True)
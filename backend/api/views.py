@@ -3,9 +3,11 @@ from rest_framework import status, viewsets
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
+from rest_framework.pagination import CursorPagination
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import get_user_model
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Q, Prefetch, Count, Exists, OuterRef
 from django.http import JsonResponse
 from django.conf import settings
 import os
@@ -28,16 +30,21 @@ from .models import Testimonial, Message, MessageGroup
 from .serializers import (
     TestimonialSerializer,
     MessageSerializer,
-    MessageGroupSerializer,
-    UserShortSerializer
+    MessageListSerializer,
+    MessageGroupSerializer
 )
 
-# Import the Testimonial model and serializer
-from .models import Testimonial
-from .serializers import TestimonialSerializer
-
 User = get_user_model()
 
+# Columns rendered by UserShortSerializer, used when prefetching group members
+USER_SHORT_FIELDS = ('id', 'username', 'first_name', 'last_name', 'email')
+
+
+def member_prefetch(lookup):
+    """Prefetch group members with only the columns the serializers need"""
+    return Prefetch(lookup, queryset=User.objects.only(*USER_SHORT_FIELDS))
+
+
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def signup(request):
@@ -156,6 +163,18 @@ class UserProfileViewSet(viewsets.GenericViewSet):
             return Response(serializer.data)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+class TestimonialCursorPagination(CursorPagination):
+    """Keyset pagination over created_at, so pages never need a COUNT(*)"""
+    ordering = '-created_at'
+    page_size = 20
+
+
+class MessageHistoryPagination(CursorPagination):
+    """Newest-first keyset pages of a group's message history"""
+    ordering = '-created_at'
+    page_size = 100
+
+
 # Add the TestimonialViewSet
 class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
     """
@@ -165,32 +184,21 @@ class TestimonialViewSet(viewsets.ReadOnlyModelViewSet):
     queryset = Testimonial.objects.filter(active=True)
     serializer_class = TestimonialSerializer
     permission_classes = [AllowAny]  # Allow public access to testimonials
+    pagination_class = TestimonialCursorPagination
     
-    def list(self, request, *args, **kwargs):
-        """Override list method to add debugging"""
-        print(f"TestimonialViewSet: Total active testimonials: {self.queryset.count()}")
-        print(f"TestimonialViewSet: All testimonials: {Testimonial.objects.all().count()}")
-        
-        # Get the queryset and serialize it
-        queryset = self.filter_queryset(self.get_queryset())
-        serializer = self.get_serializer(queryset, many=True)
-        
-        # Print the serialized data for debugging
-        print(f"TestimonialViewSet: Serialized data: {serializer.data}")
-        
-        # Standard response format
-        return Response({
-            'count': queryset.count(),
-            'next': None,
-            'previous': None,
-            'results': serializer.data
-        })
-    
+    def get_queryset(self):
+        """Only read the columns the serializer actually renders"""
+        return Testimonial.objects.filter(active=True).only(
+            'id', 'name', 'role', 'university', 'content', 'image', 'created_at'
+        )
+
     def get_serializer_context(self):
         """
         Extra context provided to the serializer class.
         """
         context = super().get_serializer_context()
+        # Resolve the absolute host prefix once so image URLs are a plain concat per row
+        context['media_base_url'] = self.request.build_absolute_uri('/').rstrip('/')
         return context
 
 #########################################################################
@@ -200,11 +208,21 @@ class MessageGroupViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return MessageGroup.objects.filter(members=self.request.user)
+        return MessageGroup.objects.filter(
+            members=self.request.user
+        ).prefetch_related(member_prefetch('members'))
 
     def perform_create(self, serializer):
-        group = serializer.save()
-        group.members.add(self.request.user)
+        member_ids = set(serializer.validated_data.pop('member_ids', []))
+        member_ids.add(self.request.user.id)
+        Members = MessageGroup.members.through
+        with transaction.atomic():
+            group = serializer.save()
+            # One INSERT for the creator and any initial members
+            Members.objects.bulk_create(
+                [Members(messagegroup_id=group.id, user_id=user_id) for user_id in member_ids],
+                ignore_conflicts=True
+            )
 
     @action(detail=True, methods=["post"], permission_classes=[IsAuthenticated])
     def add_member(self, request, pk=None):
@@ -212,12 +230,15 @@ class MessageGroupViewSet(viewsets.ModelViewSet):
         user_id = request.data.get("user_id")
         if not user_id:
             return Response({"detail": "user_id required"}, status=400)
-        try:
-            user = User.objects.get(id=user_id)
-            group.members.add(user)
-            return Response({"detail": "User added."})
-        except User.DoesNotExist:
+        if not User.objects.filter(id=user_id).exists():
             return Response({"detail": "User not found."}, status=404)
+        # Insert the through row directly; existing members are ignored
+        Members = MessageGroup.members.through
+        Members.objects.bulk_create(
+            [Members(messagegroup_id=group.id, user_id=user_id)],
+            ignore_conflicts=True
+        )
+        return Response({"detail": "User added."})
 
 class MessageViewSet(viewsets.ModelViewSet):
     queryset = Message.objects.all()
@@ -227,25 +248,34 @@ class MessageViewSet(viewsets.ModelViewSet):
     def perform_create(self, serializer):
         serializer.save(sender=self.request.user)
 
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return MessageListSerializer
+        return MessageSerializer
+
     def get_queryset(self):
         user = self.request.user
-        return Message.objects.filter(
+        queryset = Message.objects.filter(
             Q(sender=user) |
             Q(recipient=user) |
             Q(group__members=user)
-        ).distinct()
+        ).distinct().select_related('sender', 'recipient')
+        if self.action == 'list':
+            return queryset
+        return queryset.select_related('group').prefetch_related(member_prefetch('group__members'))
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_search(request):
-    print("AUTH HEADER:", request.META.get("HTTP_AUTHORIZATION"))
-    print("COOKIES:", request.COOKIES)
-    q = request.GET.get('q', '')
+    q = request.GET.get('q', '').strip()
+    # Too short to be selective; skip the table scan on initial page load
+    if len(q) < 2:
+        return Response([])
+    # Plain dicts are enough for this thin list; skip model instances and the serializer
     users = User.objects.filter(
         Q(username__icontains=q) | Q(email__icontains=q)
-    ).exclude(id=request.user.id)[:10]
-    serializer = UserShortSerializer(users, many=True)
-    return Response(serializer.data)
+    ).exclude(id=request.user.id).values(*USER_SHORT_FIELDS)[:10]
+    return Response(list(users))
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -257,25 +287,33 @@ def start_dm(request):
         other_user = User.objects.get(id=other_user_id)
     except User.DoesNotExist:
         return Response({'detail': 'User not found'}, status=404)
+    # Find a direct group containing both users with one join on the through table
+    pair_ids = {request.user.id, other_user.id}
     group = MessageGroup.objects.filter(
         is_direct=True,
-        direct_users=request.user
-    ).filter(
-        direct_users=other_user
-    ).first()
+        direct_users__in=pair_ids
+    ).annotate(
+        pair_count=Count('direct_users', distinct=True)
+    ).filter(pair_count=len(pair_ids)).first()
     if not group:
-        group = MessageGroup.objects.create(is_direct=True)
-        group.direct_users.set([request.user, other_user])
-        group.members.set([request.user, other_user])
-        group.save()
+        with transaction.atomic():
+            group = MessageGroup.objects.create(is_direct=True)
+            DirectUsers = MessageGroup.direct_users.through
+            Members = MessageGroup.members.through
+            DirectUsers.objects.bulk_create(
+                [DirectUsers(messagegroup=group, user_id=user_id) for user_id in pair_ids],
+                ignore_conflicts=True
+            )
+            Members.objects.bulk_create(
+                [Members(messagegroup=group, user_id=user_id) for user_id in pair_ids],
+                ignore_conflicts=True
+            )
     serializer = MessageGroupSerializer(group)
     return Response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def group_messages(request):
-    print("AUTH HEADER:", request.META.get("HTTP_AUTHORIZATION"))
-    print("COOKIES:", request.COOKIES)
     group_id = request.GET.get('group')
     if not group_id:
         return Response({'detail': 'Missing group query parameter.'}, status=400)
@@ -283,16 +321,24 @@ def group_messages(request):
         group_id = int(group_id)
     except ValueError:
         return Response({'detail': 'Invalid group id.'}, status=400)
-    # Check if the user is a member of the group
-    try:
-        group = MessageGroup.objects.get(id=group_id)
-    except MessageGroup.DoesNotExist:
+    # Fetch the group and check membership in a single query
+    is_member = MessageGroup.objects.filter(id=group_id).annotate(
+        is_member=Exists(MessageGroup.members.through.objects.filter(
+            messagegroup_id=OuterRef('pk'), user_id=request.user.id
+        ))
+    ).values_list('is_member', flat=True).first()
+    if is_member is None:
         return Response({'detail': 'Group not found.'}, status=404)
-    if not group.members.filter(id=request.user.id).exists():
+    if not is_member:
         return Response({'detail': 'You are not a member of this group.'}, status=403)
-    messages = Message.objects.filter(group=group).order_by('created_at')
-    serializer = MessageSerializer(messages, many=True)
-    return Response(serializer.data)
+    messages = Message.objects.filter(group_id=group_id).select_related(
+        'sender', 'recipient'
+    )
+    paginator = MessageHistoryPagination()
+    page = paginator.paginate_queryset(messages, request)
+    # Pages walk back from the newest message; render each one oldest first
+    serializer = MessageListSerializer(page[::-1], many=True)
+    return paginator.get_paginated_response(serializer.data)
 
 #########################################################################################
 
@@ -24,6 +24,12 @@ class CommunityAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at')
     date_hierarchy = 'created_at'
     inlines = [MembershipInline, PostInline]
+    list_select_related = ('creator',)
+    
+    # Counters are kept up to date by communities.signals
+    @admin.display(ordering='member_count_cache')
+    def member_count(self, obj):
+        return obj.member_count_cache
 
 @admin.register(Membership)
 class MembershipAdmin(admin.ModelAdmin):
@@ -33,6 +39,7 @@ class MembershipAdmin(admin.ModelAdmin):
     raw_id_fields = ('user', 'community')
     readonly_fields = ('joined_at', 'updated_at')
     date_hierarchy = 'joined_at'
+    list_select_related = ('user', 'community')
 
 class CommentInline(admin.TabularInline):
     model = Comment
@@ -49,12 +56,15 @@ class PostAdmin(admin.ModelAdmin):
     readonly_fields = ('created_at', 'updated_at', 'upvote_count', 'comment_count')
     date_hierarchy = 'created_at'
     inlines = [CommentInline]
+    list_select_related = ('author', 'community')
     
+    @admin.display(ordering='upvote_count_cache')
     def upvote_count(self, obj):
-        return obj.upvotes.count()
+        return obj.upvote_count_cache
     
+    @admin.display(ordering='comment_count_cache')
     def comment_count(self, obj):
-        return obj.comments.count()
+        return obj.comment_count_cache
 
 @admin.register(Comment)
 class CommentAdmin(admin.ModelAdmin):
@@ -64,12 +74,14 @@ class CommentAdmin(admin.ModelAdmin):
     raw_id_fields = ('author', 'post', 'parent')
     readonly_fields = ('created_at', 'updated_at', 'upvote_count')
     date_hierarchy = 'created_at'
+    list_select_related = ('author', 'post')
     
+    @admin.display(ordering='upvote_count_cache')
     def upvote_count(self, obj):
-        return obj.upvotes.count()
+        return obj.upvote_count_cache
     
     def is_reply(self, obj):
-        return obj.parent is not None
+        return obj.parent_id is not None
     is_reply.boolean = True
 
 @admin.register(CommunityInvitation)
@@ -78,4 +90,5 @@ class CommunityInvitationAdmin(admin.ModelAdmin):
     list_filter = ('status', 'is_sent', 'created_at')
     search_fields = ('invitee_email', 'community__name', 'inviter__username')
     raw_id_fields = ('community', 'inviter')
+    list_select_related = ('community', 'inviter')
     readonly_fields = ('created_at', 'updated_at')
@@ -1,4 +1,9 @@
+import logging
+import re
+from functools import lru_cache
+
 from django.http import JsonResponse
+from django.urls import get_resolver, get_urlconf, URLResolver
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view
 from rest_framework import status
@@ -7,6 +12,12 @@ from rest_framework.response import Response
 from .models import Community, Membership
 from .serializers import MembershipSerializer
 from .services.community_service import CommunityService
+from .utils.responses import OrjsonResponse
+
+logger = logging.getLogger(__name__)
+
+# Slug segment following communities/ in a routed path
+COMMUNITY_SLUG_RE = re.compile(r'(?:^|/)communities/([^/]+)')
 
 @api_view(['GET'])
 @csrf_exempt
@@ -37,37 +48,37 @@ def debug_join_community(request, slug):
             'error': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@lru_cache(maxsize=None)
+def collect_urls(urlconf=None):
+    """Flatten the URLconf into (pattern, name, view) dicts; routes are fixed per process"""
+    urls = []
+    # Walk depth-first with an explicit stack of pattern iterators, keeping URLconf order
+    stack = [(iter(get_resolver(urlconf).url_patterns), '')]
+    while stack:
+        patterns, parent_pattern = stack[-1]
+        pattern = next(patterns, None)
+        if pattern is None:
+            stack.pop()
+            continue
+        full_pattern = parent_pattern + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            # This is a URL resolver (includes other URL patterns)
+            stack.append((iter(pattern.url_patterns), full_pattern))
+        else:
+            callback = pattern.callback
+            urls.append({
+                'pattern': full_pattern,
+                'name': pattern.name,
+                'view': getattr(callback, '__name__', None) or str(callback)
+            })
+    return urls
+
 @api_view(['GET'])
 @csrf_exempt
 def debug_urls(request):
     """Debug view to list all registered URLs"""
-    from django.urls import get_resolver, get_urlconf, URLPattern, URLResolver
-    import re
-    
-    def collect_urls(resolver, parent_pattern=''):
-        urls = []
-        
-        for pattern in resolver.url_patterns:
-            if isinstance(pattern, URLResolver):
-                # This is a URL resolver (includes other URL patterns)
-                new_parent = parent_pattern + str(pattern.pattern)
-                urls.extend(collect_urls(pattern, new_parent))
-            else:
-                # This is a URL pattern
-                full_pattern = parent_pattern + str(pattern.pattern)
-                name = getattr(pattern, 'name', None)
-                view_name = pattern.callback.__name__ if hasattr(pattern.callback, '__name__') else str(pattern.callback)
-                urls.append({
-                    'pattern': full_pattern,
-                    'name': name,
-                    'view': view_name
-                })
-        return urls
-    
-    resolver = get_resolver(get_urlconf())
-    
     # Collect all URLs and filter those related to members
-    all_urls = collect_urls(resolver)
+    all_urls = collect_urls(get_urlconf())
     member_related_urls = [u for u in all_urls if 'member' in u['pattern']]
     
     # Get communities from DB for debugging
@@ -88,7 +99,7 @@ def debug_community_members(request, slug):
         # Get the community
         try:
             community = Community.objects.get(slug=slug)
-            print(f"DEBUG MEMBERS: Found community {community.name} (ID: {community.id})")
+            logger.debug("Members: found community %s (ID: %s)", community.name, community.id)
         except Community.DoesNotExist:
             return JsonResponse({
                 'error': f'Community with slug "{slug}" not found'
@@ -102,12 +113,12 @@ def debug_community_members(request, slug):
         # Get memberships from service
         memberships = CommunityService.get_community_members(community, role)
         
-        # Log what we found
-        print(f"DEBUG MEMBERS: Found {memberships.count()} members for community {community.name}")
-        
         # Get total count before pagination
         total_count = memberships.count()
         
+        # Log what we found
+        logger.debug("Members: found %s members for community %s", total_count, community.name)
+        
         # Apply pagination if parameters provided
         if limit and offset:
             try:
@@ -141,21 +152,17 @@ def debug_community_members(request, slug):
             if offset + limit < total_count:
                 query_params['offset'] = offset + limit
                 query_params['limit'] = limit
-                next_query = '&'.join([f"{k}={v}" for k, v in query_params.items()])
-                response_data['next'] = f"{base_url}?{next_query}"
+                response_data['next'] = f"{base_url}?{query_params.urlencode()}"
             
             # Previous page link
             if offset - limit >= 0:
                 query_params['offset'] = max(0, offset - limit)
                 query_params['limit'] = limit
-                prev_query = '&'.join([f"{k}={v}" for k, v in query_params.items()])
-                response_data['previous'] = f"{base_url}?{prev_query}"
+                response_data['previous'] = f"{base_url}?{query_params.urlencode()}"
         
-        return JsonResponse(response_data)
+        return OrjsonResponse(response_data)
     except Exception as e:
-        import traceback
-        print(f"DEBUG MEMBERS ERROR: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error listing members of community %s", slug)
         return JsonResponse({
             'error': f'An unexpected error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -168,7 +175,7 @@ def debug_membership_status(request, slug):
         # Get the community
         try:
             community = Community.objects.get(slug=slug)
-            print(f"DEBUG MEMBERSHIP STATUS: Found community {community.name} (ID: {community.id})")
+            logger.debug("Membership status: found community %s (ID: %s)", community.name, community.id)
         except Community.DoesNotExist:
             return JsonResponse({
                 'error': f'Community with slug "{slug}" not found'
@@ -183,35 +190,50 @@ def debug_membership_status(request, slug):
             })
         
         # Try to get membership
-        try:
-            membership = Membership.objects.get(community=community, user=request.user)
-            print(f"DEBUG MEMBERSHIP STATUS: Found membership for user {request.user.username}, role: {membership.role}, status: {membership.status}")
+        membership = Membership.objects.filter(
+            community=community, user=request.user
+        ).values('status', 'role').first()
+        if membership:
+            logger.debug(
+                "Membership status: user %s has role %s, status %s",
+                request.user.username, membership['role'], membership['status']
+            )
             return JsonResponse({
                 'is_member': True,
-                'status': membership.status,
-                'role': membership.role
-            })
-        except Membership.DoesNotExist:
-            print(f"DEBUG MEMBERSHIP STATUS: No membership found for user {request.user.username}")
-            return JsonResponse({
-                'is_member': False,
-                'status': None,
-                'role': None
+                'status': membership['status'],
+                'role': membership['role']
             })
+        logger.debug("Membership status: no membership for user %s", request.user.username)
+        return JsonResponse({
+            'is_member': False,
+            'status': None,
+            'role': None
+        })
     except Exception as e:
-        import traceback
-        print(f"DEBUG MEMBERSHIP STATUS ERROR: {str(e)}")
-        print(traceback.format_exc())
+        logger.exception("Error reading membership status for community %s", slug)
         return JsonResponse({
             'error': f'An unexpected error occurred: {str(e)}'
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@lru_cache(maxsize=None)
+def community_url_patterns(urlconf=None):
+    """Top-level URL patterns mentioning communities; fixed per process like collect_urls"""
+    patterns = []
+    for pattern in get_resolver(urlconf).url_patterns:
+        pattern_str = str(pattern.pattern)
+        if 'communities' in pattern_str:
+            patterns.append({
+                'pattern': pattern_str,
+                'name': getattr(pattern, 'name', None),
+                'lookup_str': getattr(pattern, 'lookup_str', None)
+            })
+    return patterns
+
 @api_view(['GET'])
 @csrf_exempt
 def route_debug(request, path):
     """Debug view to analyze how a request is routed"""
     from django.urls import resolve, Resolver404
-    from django.urls.resolvers import get_resolver
     
     # Try to resolve the path
     full_path = f"/api/{path}"
@@ -238,28 +260,15 @@ def route_debug(request, path):
         result['resolver_match'] = "No match found"
     
     # Check if the community exists
-    if 'communities/' in path and '/' in path:
-        parts = path.split('/')
-        for i, part in enumerate(parts):
-            if parts[i-1] == 'communities' and i > 0:
-                slug = part
-                from .models import Community
-                result['community_exists'] = Community.objects.filter(slug=slug).exists()
-                if result['community_exists']:
-                    community = Community.objects.get(slug=slug)
-                    result['community_id'] = community.id
-                    result['community_name'] = community.name
-                break
+    slug_match = COMMUNITY_SLUG_RE.search(path)
+    if slug_match:
+        community = Community.objects.filter(slug=slug_match.group(1)).values('id', 'name').first()
+        result['community_exists'] = community is not None
+        if community:
+            result['community_id'] = community['id']
+            result['community_name'] = community['name']
     
-    # Print all patterns that could match this path
-    resolver = get_resolver()
-    for pattern in resolver.url_patterns:
-        pattern_str = str(pattern.pattern)
-        if 'communities' in pattern_str:
-            result['matching_patterns'].append({
-                'pattern': pattern_str,
-                'name': getattr(pattern, 'name', None),
-                'lookup_str': getattr(pattern, 'lookup_str', None)
-            })
+    # Top-level patterns that could match this path
+    result['matching_patterns'] = community_url_patterns(get_urlconf())
     
     return JsonResponse(result)
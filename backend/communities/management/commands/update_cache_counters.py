@@ -1,69 +1,36 @@
 from django.core.management.base import BaseCommand
-from communities.models import Community, Post, Comment, Membership
-from django.db.models import Count
+from communities.signals import (
+    update_community_member_counts,
+    update_post_counts,
+    update_comment_upvote_counts,
+)
 
 
 class Command(BaseCommand):
     help = 'Updates all cache counter fields in the communities app'
 
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', type=int, default=500,
+            help='Rows per UPDATE statement (primary key range); 0 updates each table in one statement'
+        )
+
     def handle(self, *args, **options):
+        # One aggregated UPDATE per batch instead of a COUNT + UPDATE per row.
+        # Each batch commits on its own, so a large table never sits behind one
+        # long transaction; the counts are idempotent, so a partial run is safe.
+        batch_size = options['batch_size']
+
         self.stdout.write(self.style.SUCCESS('Updating community member counts...'))
-        
-        # Update community member counts
-        communities = Community.objects.all()
-        count = 0
-        for community in communities:
-            member_count = Membership.objects.filter(
-                community=community,
-                status='approved'
-            ).count()
-            
-            Community.objects.filter(id=community.id).update(
-                member_count_cache=member_count
-            )
-            count += 1
-            
-            if count % 100 == 0:
-                self.stdout.write(f'  Updated {count} communities')
-                
+        count = update_community_member_counts(batch_size)
         self.stdout.write(self.style.SUCCESS(f'Updated {count} community member counts'))
-        
+
         self.stdout.write(self.style.SUCCESS('Updating post counters...'))
-        
-        # Update post counters
-        posts = Post.objects.all()
-        count = 0
-        for post in posts:
-            comment_count = Comment.objects.filter(post=post).count()
-            upvote_count = post.upvotes.count()
-            
-            Post.objects.filter(id=post.id).update(
-                comment_count_cache=comment_count,
-                upvote_count_cache=upvote_count
-            )
-            count += 1
-            
-            if count % 100 == 0:
-                self.stdout.write(f'  Updated {count} posts')
-                
+        count = update_post_counts(batch_size)
         self.stdout.write(self.style.SUCCESS(f'Updated {count} post counters'))
-        
+
         self.stdout.write(self.style.SUCCESS('Updating comment upvote counts...'))
-        
-        # Update comment upvote counts
-        comments = Comment.objects.all()
-        count = 0
-        for comment in comments:
-            upvote_count = comment.upvotes.count()
-            
-            Comment.objects.filter(id=comment.id).update(
-                upvote_count_cache=upvote_count
-            )
-            count += 1
-            
-            if count % 100 == 0:
-                self.stdout.write(f'  Updated {count} comments')
-                
+        count = update_comment_upvote_counts(batch_size)
         self.stdout.write(self.style.SUCCESS(f'Updated {count} comment upvote counts'))
-        
-        self.stdout.write(self.style.SUCCESS('All cache counters updated successfully!')) 
\ No newline at end of file
+
+        self.stdout.write(self.style.SUCCESS('All cache counters updated successfully!'))
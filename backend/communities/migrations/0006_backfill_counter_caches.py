@@ -0,0 +1,42 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    """Correlated COUNT(*) of queryset rows whose field points at the outer row"""
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def backfill_counter_caches(apps, schema_editor):
+    Community = apps.get_model('communities', 'Community')
+    Membership = apps.get_model('communities', 'Membership')
+    Post = apps.get_model('communities', 'Post')
+    Comment = apps.get_model('communities', 'Comment')
+    PostUpvote = Post.upvotes.through
+    CommentUpvote = Comment.upvotes.through
+
+    Community.objects.update(
+        member_count_cache=count_subquery(Membership.objects.filter(status='approved'), 'community')
+    )
+    Post.objects.update(
+        comment_count_cache=count_subquery(Comment.objects.all(), 'post'),
+        upvote_count_cache=count_subquery(PostUpvote.objects.all(), 'post'),
+    )
+    Comment.objects.update(
+        upvote_count_cache=count_subquery(CommentUpvote.objects.all(), 'comment'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0005_alter_post_tags'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_counter_caches, migrations.RunPython.noop),
+    ]
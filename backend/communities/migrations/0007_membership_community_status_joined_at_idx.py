@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 17:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0006_backfill_counter_caches'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['community', 'status', 'joined_at'], name='communities_communi_dac92b_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-15 18:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0007_membership_community_status_joined_at_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='membership',
+            index=models.Index(fields=['user', 'community'], include=('role', 'status'), name='communities_membership_cov_idx'),
+        ),
+    ]
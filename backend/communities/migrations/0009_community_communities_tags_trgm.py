@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-15 18:14
+
+import django.contrib.postgres.indexes
+from django.db import migrations
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('communities', '0008_membership_communities_membership_cov_idx'),
+        # pg_trgm is enabled there
+        ('users', '0003_user_users_username_trgm_user_users_email_trgm'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='community',
+            index=django.contrib.postgres.indexes.GinIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('tags'), name='gin_trgm_ops'), name='communities_tags_trgm'),
+        ),
+    ]
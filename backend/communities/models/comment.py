@@ -36,7 +36,15 @@ class Comment(models.Model):
     
     @property
     def upvote_count(self):
-        return self.upvote_count_cache if self.upvote_count_cache > 0 else self.upvotes.count()
+        return self.upvote_count_cache
+    
+    # Query the upvotes through table directly; its unique (comment_id, user_id)
+    # index covers both lookups without joining users
+    def count_upvotes(self):
+        return Comment.upvotes.through.objects.filter(comment_id=self.id).count()
+    
+    def is_upvoted_by(self, user):
+        return Comment.upvotes.through.objects.filter(comment_id=self.id, user_id=user.id).exists()
     
     @property
     def is_reply(self):
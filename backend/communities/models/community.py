@@ -1,7 +1,10 @@
-from django.db import models
+import re
+
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.db import models, transaction, IntegrityError
+from django.db.models.functions import Upper
 from django.conf import settings
 from django.utils.text import slugify
-from django.core.cache import cache
 
 
 class Community(models.Model):
@@ -60,64 +63,69 @@ class Community(models.Model):
             models.Index(fields=['name']),
             models.Index(fields=['is_private', '-created_at']),
             models.Index(fields=['requires_approval']),
+            # Trigram index for the case-insensitive tag filter and search,
+            # which Postgres runs as UPPER(tags) LIKE and a btree can't serve
+            GinIndex(OpClass(Upper('tags'), name='gin_trgm_ops'), name='communities_tags_trgm'),
         ]
     
     def __str__(self):
         return self.name
     
+    @classmethod
+    def unique_slug(cls, base_slug):
+        """Return base_slug, or base_slug-N for the first free N, in one query"""
+        # startswith compiles to LIKE 'base%' which the slug index can serve
+        suffix = re.compile(rf'^{re.escape(base_slug)}-(\d+)$')
+        taken = set()
+        for slug in cls.objects.filter(slug__startswith=base_slug).values_list('slug', flat=True):
+            if slug == base_slug:
+                taken.add(0)
+            else:
+                match = suffix.match(slug)
+                if match:
+                    taken.add(int(match.group(1)))
+        if 0 not in taken:
+            return base_slug
+        i = 1
+        while i in taken:
+            i += 1
+        return f"{base_slug}-{i}"
+    
     def save(self, *args, **kwargs):
         # Auto-generate slug if not provided
-        if not self.slug:
-            self.slug = slugify(self.name)
-            
-            # Check if slug already exists
-            if Community.objects.filter(slug=self.slug).exists():
-                # Append a number to the slug
-                base_slug = self.slug
-                i = 1
-                while Community.objects.filter(slug=f"{base_slug}-{i}").exists():
-                    i += 1
-                self.slug = f"{base_slug}-{i}"
+        generate_slug = not self.slug
+        if generate_slug:
+            self.slug = self.unique_slug(slugify(self.name))
         
         # Ensure short_description exists
         if not self.short_description and self.description:
             self.short_description = self.description[:252] + '...' if len(self.description) > 255 else self.description
             
-        # Clear cache when saving
-        cache_key = f"community:slug:{self.slug}"
-        cache.delete(cache_key)
-            
-        super().save(*args, **kwargs)
+        if not generate_slug:
+            super().save(*args, **kwargs)
+        else:
+            # Another request may claim the same slug between the lookup and the
+            # INSERT; pick the next free one and retry instead of failing
+            for attempt in range(3):
+                try:
+                    with transaction.atomic():
+                        super().save(*args, **kwargs)
+                    break
+                except IntegrityError:
+                    if attempt == 2 or not Community.objects.filter(slug=self.slug).exists():
+                        raise
+                    self.slug = self.unique_slug(slugify(self.name))
+        # The slug cache is cleared on commit by communities.signals
     
     @property
     def member_count(self):
-        """Get the number of members in this community"""
-        return self.member_count_cache if self.member_count_cache > 0 else self.members.count()
-        
-    @classmethod
-    def get_by_slug(cls, slug):
-        """
-        Efficiently get a community by slug using cache
-        """
-        if not slug:
-            return None
-            
-        # Generate cache key for this slug
-        cache_key = f"community:slug:{slug}"
-        
-        # Try to get from cache
-        community = cache.get(cache_key)
+        """Get the number of approved members, maintained by communities.signals"""
+        return self.member_count_cache
         
-        if not community:
-            # If not in cache, load from database with select_related for better performance
-            try:
-                community = cls.objects.select_related('creator').get(slug=slug)
-                # Cache for 5 minutes
-                cache.set(cache_key, community, 300)
-            except cls.DoesNotExist:
-                return None
-                
-        return community
+    @staticmethod
+    def slug_cache_keys(slug):
+        """Cache keys holding the community looked up by slug"""
+        return [f"community:slug:{slug}"]
 
     @property
     def tag_list(self):
@@ -165,7 +173,25 @@ class Membership(models.Model):
             models.Index(fields=['role', 'status']),
             models.Index(fields=['community', 'role']),
             models.Index(fields=['user', 'status']),
+            # Approved-member counts and member listings per community, the latter
+            # read in joined_at order
+            models.Index(fields=['community', 'status', 'joined_at']),
+            # Per-request membership lookups read role/status for one (user, community);
+            # carrying them in the index lets Postgres answer with an index-only scan
+            models.Index(
+                fields=['user', 'community'],
+                include=['role', 'status'],
+                name='communities_membership_cov_idx',
+            ),
         ]
     
     def __str__(self):
-        return f"{self.user.username} - {self.community.name} ({self.role})" 
\ No newline at end of file
+        return f"{self.user.username} - {self.community.name} ({self.role})"
+    
+    @staticmethod
+    def user_cache_keys(community, user_id):
+        """Cache keys holding user_id's membership state in community"""
+        return [
+            f"membership_status:{community.id}:{user_id}",
+            f"post_creation_permission:{community.id}:{user_id}",
+        ] 
\ No newline at end of file
@@ -16,6 +16,10 @@ class Post(models.Model):
         ('other', 'Other'),
     ]
     
+    # Newest top-level comments embedded in the post detail response; the full
+    # thread is paginated by the comments endpoint
+    PREVIEW_COMMENTS = 3
+    
     VISIBILITY_CHOICES = [
         ('public', 'Public - Visible to everyone'),
         ('members', 'Members Only - Visible only to community members'),
@@ -80,68 +84,47 @@ class Post(models.Model):
         """Optimized save method with cache invalidation"""
         is_new = self._state.adding
         
-        # Use transaction to ensure atomicity
-        with transaction.atomic():
-            # Call the original save method
-            super().save(*args, **kwargs)
+        # Call the original save method
+        super().save(*args, **kwargs)
+        
+        # If this is a new post, invalidate community post listings and the
+        # cached community lists, which carry post_count. The counts are read
+        # from the *_count_cache columns, so an edit has nothing to clear
+        if is_new:
+            # Imported here: the utils package pulls in DRF, which must not load with the models
+            from ..utils.cache import bump_community_rev
             
-            # Invalidate relevant caches
+            community_id = self.community_id
             cache_keys = [
-                f"post:comment_count:{self.id}",
-                f"post:upvote_count:{self.id}",
-                f"post:top_comments:{self.id}",
+                f"community:post_count:{community_id}",
+                f"community:recent_posts:{community_id}",
             ]
-            cache.delete_many(cache_keys)
             
-            # If this is a new post, invalidate community post listings
-            if is_new:
-                cache.delete(f"community:post_count:{self.community_id}")
-                cache.delete(f"community:recent_posts:{self.community_id}")
+            def invalidate():
+                cache.delete_many(cache_keys)
+                bump_community_rev(community_id)
+            
+            # Invalidate after commit: no Redis round-trip while the transaction is
+            # open, and no window for a reader to re-cache the uncommitted state
+            transaction.on_commit(invalidate)
     
+    # The *_count_cache fields are kept exact by communities.signals (and
+    # backfilled by migration), so zero is a real count, not "unknown"
     @property
     def upvote_count(self):
-        """Get upvote count efficiently from cache or model"""
-        # First try the cache field for best performance
-        if self.upvote_count_cache > 0:
-            return self.upvote_count_cache
-        
-        # Try to get from cache
-        cache_key = f"post:upvote_count:{self.id}"
-        cached_count = cache.get(cache_key)
-        if cached_count is not None:
-            return cached_count
-        
-        # Calculate and cache the count
-        count = self.upvotes.count()
-        cache.set(cache_key, count, 300)  # Cache for 5 minutes
-        
-        # Update the model cache field if different
-        if count != self.upvote_count_cache:
-            self.__class__.objects.filter(id=self.id).update(upvote_count_cache=count)
-            self.upvote_count_cache = count
-            
-        return count
+        """Get upvote count from the signal-maintained cache field"""
+        return self.upvote_count_cache
     
     @property
     def comment_count(self):
-        """Get comment count efficiently from cache or model"""
-        # First try the cache field for best performance
-        if self.comment_count_cache > 0:
-            return self.comment_count_cache
-        
-        # Try to get from cache
-        cache_key = f"post:comment_count:{self.id}"
-        cached_count = cache.get(cache_key)
-        if cached_count is not None:
-            return cached_count
-        
-        # Calculate and cache the count
-        count = self.comments.count()
-        cache.set(cache_key, count, 300)  # Cache for 5 minutes
-        
-        # Update the model cache field if different
-        if count != self.comment_count_cache:
-            self.__class__.objects.filter(id=self.id).update(comment_count_cache=count)
-            self.comment_count_cache = count
-            
-        return count 
\ No newline at end of file
+        """Get comment count from the signal-maintained cache field"""
+        return self.comment_count_cache
+    
+    # The upvotes through table has a unique (post_id, user_id) index, so
+    # querying it directly avoids a join to users and can be index-only
+    def count_upvotes(self):
+        return Post.upvotes.through.objects.filter(post_id=self.id).count()
+    
+    def is_upvoted_by(self, user):
+        return Post.upvotes.through.objects.filter(post_id=self.id, user_id=user.id).exists()
+
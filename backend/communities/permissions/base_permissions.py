@@ -1,5 +1,6 @@
 from rest_framework import permissions
-from ..models import Membership
+from ..models import Community
+from .checker import get_membership
 
 
 class BaseCommunityPermission(permissions.BasePermission):
@@ -7,44 +8,73 @@ class BaseCommunityPermission(permissions.BasePermission):
     Base permission class for community-related permissions with common functionality.
     """
     
-    def is_community_admin(self, user, community):
+    # Community columns the permission checks read
+    COMMUNITY_FIELDS = ('id', 'creator_id', 'is_private')
+    
+    def get_membership_role(self, request, community):
+        """Role of the user's approved membership in community, or None"""
+        membership = get_membership(request, community)
+        if membership and membership['status'] == 'approved':
+            return membership['role']
+        return None
+    
+    def is_site_superuser(self, user):
+        """Superusers pass every community check without a query"""
+        return user.is_authenticated and user.is_superuser
+    
+    def is_community_creator(self, user, community):
+        """Compare ids so the creator row is never loaded"""
+        return getattr(community, 'creator_id', None) == user.pk
+    
+    def is_community_admin(self, request, community):
         """Check if the user is an admin or moderator of the community."""
+        user = request.user
         if not user.is_authenticated:
             return False
-            
+        if self.is_site_superuser(user):
+            return True
+    
         # Check if user is the creator of the community
-        if hasattr(community, 'creator') and community.creator == user:
+        if self.is_community_creator(user, community):
             return True
-            
+    
         # Check if user is an admin or moderator
-        return Membership.objects.filter(
-            user=user,
-            community=community,
-            role__in=['admin', 'moderator'],
-            status='approved'
-        ).exists()
-    
-    def is_community_member(self, user, community):
+        return self.get_membership_role(request, community) in ('admin', 'moderator')
+    
+    def is_community_member(self, request, community):
         """Check if the user is a member of the community."""
+        user = request.user
         if not user.is_authenticated:
             return False
-            
+        if self.is_site_superuser(user):
+            return True
+    
         # Creator is always considered a member
-        if hasattr(community, 'creator') and community.creator == user:
+        if self.is_community_creator(user, community):
             return True
-            
+    
         # Check if user is an approved member
-        return Membership.objects.filter(
-            user=user,
-            community=community,
-            status='approved'
-        ).exists()
-        
+        return self.get_membership_role(request, community) is not None
+    
     def get_community_from_object(self, obj):
-        """Extract the community object from various object types."""
-        if hasattr(obj, 'community'):
-            return obj.community
-        elif hasattr(obj, 'post') and hasattr(obj.post, 'community'):
-            return obj.post.community
+        """Extract the community object from various object types, once per object."""
+        community = getattr(obj, '_resolved_community', None)
+        if community is None:
+            community = self.resolve_community(obj)
+            # Chained permission classes check the same object; keep what was found
+            obj._resolved_community = community
+        return community
+    
+    def resolve_community(self, obj):
+        """Walk from obj to its community without caching the result."""
+        # When the community isn't loaded already, fetch only the columns the checks read
+        if hasattr(obj, 'community_id'):
+            if type(obj).community.is_cached(obj):
+                return obj.community
+            return Community.objects.only(*self.COMMUNITY_FIELDS).get(pk=obj.community_id)
+        elif hasattr(obj, 'post_id'):
+            if type(obj).post.is_cached(obj):
+                return self.resolve_community(obj.post)
+            return Community.objects.only(*self.COMMUNITY_FIELDS).get(posts__id=obj.post_id)
         else:
-            return obj  # Assuming the object itself is a community 
\ No newline at end of file
+            return obj  # Assuming the object itself is a community
@@ -0,0 +1,41 @@
+from ..models import Membership
+
+
+def _membership_cache(request):
+    """Per-request memo of {(user_id, community_id): {'role', 'status'} or None}"""
+    memberships = getattr(request, '_membership_cache', None)
+    if memberships is None:
+        memberships = request._membership_cache = {}
+    return memberships
+
+
+def prefetch_memberships(request, community_ids):
+    """Load request.user's memberships for many communities with one query"""
+    user = request.user
+    if not user.is_authenticated:
+        return
+    memberships = _membership_cache(request)
+    missing = {cid for cid in community_ids if (user.pk, cid) not in memberships}
+    if not missing:
+        return
+    for cid in missing:
+        memberships[(user.pk, cid)] = None
+    for row in Membership.objects.filter(user=user, community_id__in=missing).values('community_id', 'role', 'status'):
+        memberships[(user.pk, row.pop('community_id'))] = row
+
+
+def get_membership(request, community):
+    """
+    Return request.user's membership in community as {'role', 'status'}, or None.
+    The row is read once per request and shared by permissions and serializers.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return None
+    memberships = _membership_cache(request)
+    key = (user.pk, community.pk)
+    if key not in memberships:
+        memberships[key] = Membership.objects.filter(
+            user=user, community_id=community.pk
+        ).values('role', 'status').first()
+    return memberships[key]
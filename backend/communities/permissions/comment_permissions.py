@@ -18,6 +18,10 @@ class IsCommentAuthorOrCommunityAdminOrReadOnly(BaseCommunityPermission):
         if not request.user.is_authenticated:
             return False
         
+        # Superusers skip the community lookups entirely
+        if self.is_site_superuser(request.user):
+            return True
+        
         # Comment author can edit
         if obj.author == request.user:
             return True
@@ -26,4 +30,4 @@ class IsCommentAuthorOrCommunityAdminOrReadOnly(BaseCommunityPermission):
         community = self.get_community_from_object(obj)
         
         # Community admins/moderators can edit
-        return self.is_community_admin(request.user, community) 
\ No newline at end of file
+        return self.is_community_admin(request, community) 
\ No newline at end of file
@@ -15,11 +15,15 @@ class IsCommunityAdminOrReadOnly(BaseCommunityPermission):
         if request.method in permissions.SAFE_METHODS:
             return True
         
+        # Superusers skip the community lookups entirely
+        if self.is_site_superuser(request.user):
+            return True
+        
         # Get the community from the object
         community = self.get_community_from_object(obj)
         
         # Check if user is admin/moderator
-        return self.is_community_admin(request.user, community)
+        return self.is_community_admin(request, community)
 
 
 class IsCommunityMember(BaseCommunityPermission):
@@ -33,8 +37,12 @@ class IsCommunityMember(BaseCommunityPermission):
         if not request.user.is_authenticated:
             return False
         
+        # Superusers skip the community lookups entirely
+        if self.is_site_superuser(request.user):
+            return True
+        
         # Get the community from the object
         community = self.get_community_from_object(obj)
         
         # Check if user is a member
-        return self.is_community_member(request.user, community) 
\ No newline at end of file
+        return self.is_community_member(request, community) 
\ No newline at end of file
@@ -18,10 +18,14 @@ class IsPostAuthorOrCommunityAdminOrReadOnly(BaseCommunityPermission):
         if not request.user.is_authenticated:
             return False
         
+        # Superusers skip the community lookups entirely
+        if self.is_site_superuser(request.user):
+            return True
+        
         # Post author can edit
         if obj.author == request.user:
             return True
         
         # Community admins/moderators can edit
         community = self.get_community_from_object(obj)
-        return self.is_community_admin(request.user, community) 
\ No newline at end of file
+        return self.is_community_admin(request, community) 
\ No newline at end of file
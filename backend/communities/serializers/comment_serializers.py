@@ -25,15 +25,24 @@ class CommentSerializer(serializers.ModelSerializer):
     
     @extend_schema_field(OpenApiTypes.INT)
     def get_reply_count(self, obj):
-        return obj.replies.count()
+        # Annotated by CommentService.get_comment_queryset; other querysets count here
+        reply_count = getattr(obj, 'reply_count_ann', None)
+        if reply_count is None:
+            reply_count = obj.replies.count()
+        return reply_count
     
     @extend_schema_field(OpenApiTypes.INT)
     def get_upvote_count(self, obj):
-        return obj.upvote_count
+        return obj.upvote_count_cache
     
     @extend_schema_field(OpenApiTypes.BOOL)
     def get_has_upvoted(self, obj):
         user = self.context.get('request').user
-        if user.is_authenticated:
-            return obj.upvotes.filter(id=user.id).exists()
-        return False 
\ No newline at end of file
+        if not user.is_authenticated:
+            return False
+        
+        # Prefetched by CommentService.get_comment_queryset for the request user
+        my_upvote = getattr(obj, '_my_upvote', None)
+        if my_upvote is not None:
+            return bool(my_upvote)
+        return obj.is_upvoted_by(user) 
\ No newline at end of file
@@ -1,15 +1,21 @@
 from rest_framework import serializers
-from django.db import transaction
+from django.db import models, transaction, IntegrityError
+from django.db.models import Count, Prefetch, Q, Value
+from django.db.models.functions import Concat
 from django.utils.text import slugify
 from drf_spectacular.utils import extend_schema_field
 from drf_spectacular.types import OpenApiTypes
 from django.core.cache import cache
+from django.contrib.auth import get_user_model
 
 from ..models import Community, Membership, CommunityInvitation, Post
 from .user_serializers import UserBasicSerializer
 from .post_serializers import PostSerializer
+from ..permissions.checker import get_membership, prefetch_memberships
 from ..utils.cache import cached_method
 
+User = get_user_model()
+
 
 class UserMembershipStatusSerializer(serializers.ModelSerializer):
     """Serializer specifically for returning the user's membership status."""
@@ -25,6 +31,39 @@ class UserMembershipStatusSerializer(serializers.ModelSerializer):
         return True
 
 
+def get_post_counts(community_ids):
+    """Post counts for many communities: one cache.get_many, one GROUP BY for the misses"""
+    keys = {f"community:post_count:{cid}": cid for cid in community_ids}
+    counts = {keys[key]: count for key, count in cache.get_many(list(keys)).items()}
+    missing = [cid for cid in community_ids if cid not in counts]
+    if missing:
+        fresh = dict.fromkeys(missing, 0)
+        fresh.update(
+            Post.objects.filter(community_id__in=missing).order_by()
+            .values_list('community_id').annotate(count=Count('id'))
+        )
+        # Cache for 5 minutes
+        cache.set_many({f"community:post_count:{cid}": count for cid, count in fresh.items()}, 300)
+        counts.update(fresh)
+    return counts
+
+
+class CommunityListSerializer(serializers.ListSerializer):
+    """Loads the page's post counts and the request user's memberships in bulk"""
+    
+    def to_representation(self, data):
+        communities = list(data.all() if isinstance(data, models.Manager) else data)
+        community_ids = [community.pk for community in communities]
+        # Querysets from CommunityService.get_community_queryset arrive with post_count_ann
+        uncounted = [community.pk for community in communities if getattr(community, 'post_count_ann', None) is None]
+        if uncounted:
+            self.context['post_counts'] = get_post_counts(uncounted)
+        request = self.context.get('request')
+        if request is not None:
+            prefetch_memberships(request, community_ids)
+        return super().to_representation(communities)
+
+
 class CommunitySerializer(serializers.ModelSerializer):
     """Serializer for communities"""
     creator = UserBasicSerializer(read_only=True)
@@ -44,6 +83,7 @@ class CommunitySerializer(serializers.ModelSerializer):
             'created_at', 'updated_at'
         ]
         read_only_fields = ['slug', 'creator', 'created_at', 'updated_at']
+        list_serializer_class = CommunityListSerializer
     
     @extend_schema_field(OpenApiTypes.INT)
     def get_member_count(self, obj):
@@ -51,6 +91,14 @@ class CommunitySerializer(serializers.ModelSerializer):
     
     @extend_schema_field(OpenApiTypes.INT)
     def get_post_count(self, obj):
+        # Annotated by the service queryset, or loaded for the page by CommunityListSerializer
+        count = getattr(obj, 'post_count_ann', None)
+        if count is not None:
+            return count
+        counts = self.context.get('post_counts')
+        if counts and obj.id in counts:
+            return counts[obj.id]
+        
         # Use the cached count if available
         cache_key = f"community:post_count:{obj.id}"
         count = cache.get(cache_key)
@@ -60,6 +108,10 @@ class CommunitySerializer(serializers.ModelSerializer):
             cache.set(cache_key, count, 300)
         return count
     
+    def get_membership(self, obj):
+        """The request user's membership row, or None; shared with the permission checks"""
+        return get_membership(self.context.get('request'), obj)
+    
     @extend_schema_field(OpenApiTypes.BOOL)
     def get_is_member(self, obj):
         user = self.context.get('request').user
@@ -67,17 +119,10 @@ class CommunitySerializer(serializers.ModelSerializer):
             return False
             
         # Creator is always considered a member
-        if obj.creator and obj.creator.id == user.id:
+        if obj.creator_id == user.id:
             return True
             
-        # Use cache for membership check
-        cache_key = f"community:is_member:{obj.id}:{user.id}"
-        is_member = cache.get(cache_key)
-        if is_member is None:
-            is_member = obj.members.filter(id=user.id).exists()
-            # Cache for 5 minutes
-            cache.set(cache_key, is_member, 300)
-        return is_member
+        return self.get_membership(obj) is not None
     
     @extend_schema_field(OpenApiTypes.STR)
     def get_membership_status(self, obj):
@@ -86,21 +131,11 @@ class CommunitySerializer(serializers.ModelSerializer):
             return None
             
         # Creator is always considered approved
-        if obj.creator and obj.creator.id == user.id:
+        if obj.creator_id == user.id:
             return 'approved'
             
-        # Use cache for membership status
-        cache_key = f"community:membership_status:{obj.id}:{user.id}"
-        status = cache.get(cache_key)
-        if status is None:
-            try:
-                membership = Membership.objects.get(user=user, community=obj)
-                status = membership.status
-            except Membership.DoesNotExist:
-                status = None
-            # Cache for 5 minutes
-            cache.set(cache_key, status, 300)
-        return status
+        membership = self.get_membership(obj)
+        return membership['status'] if membership else None
     
     @extend_schema_field(OpenApiTypes.STR)
     def get_membership_role(self, obj):
@@ -109,21 +144,11 @@ class CommunitySerializer(serializers.ModelSerializer):
             return None
             
         # Creator is always considered admin
-        if obj.creator and obj.creator.id == user.id:
+        if obj.creator_id == user.id:
             return 'admin'
             
-        # Use cache for membership role
-        cache_key = f"community:membership_role:{obj.id}:{user.id}"
-        role = cache.get(cache_key)
-        if role is None:
-            try:
-                membership = Membership.objects.get(user=user, community=obj)
-                role = membership.role
-            except Membership.DoesNotExist:
-                role = None
-            # Cache for 5 minutes
-            cache.set(cache_key, role, 300)
-        return role
+        membership = self.get_membership(obj)
+        return membership['role'] if membership else None
 
 
 class CommunityDetailSerializer(CommunitySerializer):
@@ -139,20 +164,38 @@ class CommunityDetailSerializer(CommunitySerializer):
         cache_key = f"community:recent_posts:{obj.id}"
         data = cache.get(cache_key)
         if data is None:
-            posts = obj.posts.order_by('-is_pinned', '-created_at')[:5]
+            # Authors in the same query; the empty _my_upvote prefetch keeps has_upvoted
+            # from querying per post, since the cached copy is shared by all users
+            posts = obj.posts.select_related('author').prefetch_related(
+                Prefetch('upvotes', queryset=User.objects.none(), to_attr='_my_upvote')
+            ).order_by('-is_pinned', '-created_at')[:5]
             serializer = PostSerializer(posts, many=True, context=self.context)
             data = serializer.data
             # Cache for 3 minutes
             cache.set(cache_key, data, 180)
-        return data
+        
+        # has_upvoted is per user, so fill it in for the whole list with one query
+        user = self.context['request'].user
+        upvoted = set()
+        if user.is_authenticated and data:
+            upvoted = set(Post.upvotes.through.objects.filter(
+                post_id__in=[post['id'] for post in data], user_id=user.id
+            ).values_list('post_id', flat=True))
+        return [dict(post, has_upvoted=post['id'] in upvoted) for post in data]
     
     @extend_schema_field(serializers.ListField(child=serializers.DictField()))
     def get_admins(self, obj):
         cache_key = f"community:admins:{obj.id}"
         data = cache.get(cache_key)
         if data is None:
-            admin_memberships = obj.membership_set.filter(role__in=['admin', 'moderator'])
-            admins = [membership.user for membership in admin_memberships]
+            # Join from the user side so only the serialized columns are loaded,
+            # with full_name concatenated by the database
+            admins = User.objects.filter(
+                membership__community=obj,
+                membership__role__in=['admin', 'moderator']
+            ).annotate(
+                full_name_ann=Concat('first_name', Value(' '), 'last_name')
+            ).only('id', 'username', 'email')
             serializer = UserBasicSerializer(admins, many=True)
             data = serializer.data
             # Cache for 5 minutes
@@ -170,6 +213,10 @@ class CommunityCreateSerializer(serializers.ModelSerializer):
             'category', 'tags', 'image', 'banner',
             'rules', 'is_private', 'requires_approval'
         ]
+        # validate_name covers the name's unique constraint in its own query
+        extra_kwargs = {'name': {'validators': []}}
+    
+    DUPLICATE_NAME_MESSAGE = "A community with this or a similar name already exists. Please choose a different name."
     
     def validate_name(self, value):
         """
@@ -177,14 +224,10 @@ class CommunityCreateSerializer(serializers.ModelSerializer):
         This validation occurs before the slug is created, 
         so we need to validate against potential slug conflicts.
         """
-        # Generate the slug that would be created
-        slug = slugify(value)
-        
-        # Check if a community with this slug already exists
-        if Community.objects.filter(slug=slug).exists():
-            raise serializers.ValidationError(
-                "A community with this or a similar name already exists. Please choose a different name."
-            )
+        # One query for both the exact name and the slug it would generate;
+        # create() still maps a racing INSERT's IntegrityError to the same error
+        if Community.objects.filter(Q(name=value) | Q(slug=slugify(value))).exists():
+            raise serializers.ValidationError(self.DUPLICATE_NAME_MESSAGE)
         return value
     
     def create(self, validated_data):
@@ -198,15 +241,20 @@ class CommunityCreateSerializer(serializers.ModelSerializer):
             validated_data['requires_approval'] = validated_data['requires_approval'].lower() == 'true'
         
         # Use transaction to ensure atomicity
-        with transaction.atomic():
-            # Create the community
-            community = Community.objects.create(creator=user, **validated_data)
-            
-            # Create admin membership for the creator if it doesn't exist
-            Membership.objects.get_or_create(
-                user=user,
-                community=community,
-                defaults={'role': 'admin', 'status': 'approved'}
-            )
-            
-            return community 
\ No newline at end of file
+        try:
+            with transaction.atomic():
+                # Create the community; the creator's membership below is its only member
+                community = Community.objects.create(creator=user, member_count_cache=1, **validated_data)
+                
+                # A brand-new community has no memberships, so insert without the
+                # get_or_create SELECT. bulk_create skips post_save, which is why
+                # member_count_cache is set above rather than by the signal
+                Membership.objects.bulk_create(
+                    [Membership(user=user, community=community, role='admin', status='approved')],
+                    ignore_conflicts=True
+                )
+        except IntegrityError:
+            # Another request created the same name since validate_name ran
+            raise serializers.ValidationError({'name': [self.DUPLICATE_NAME_MESSAGE]})
+        
+        return community 
\ No newline at end of file
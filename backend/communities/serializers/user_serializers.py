@@ -16,4 +16,8 @@ class UserBasicSerializer(serializers.ModelSerializer):
     
     @extend_schema_field(OpenApiTypes.STR)
     def get_full_name(self, obj):
-        return f"{obj.first_name} {obj.last_name}" 
\ No newline at end of file
+        # User querysets annotated with full_name_ann skip loading the name columns
+        full_name = getattr(obj, 'full_name_ann', None)
+        if full_name is None:
+            full_name = f"{obj.first_name} {obj.last_name}"
+        return full_name 
\ No newline at end of file
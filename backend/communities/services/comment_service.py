@@ -1,5 +1,6 @@
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Prefetch
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, OuterRef, Q, Prefetch
 from rest_framework.exceptions import PermissionDenied
 
 from ..models import Post, Comment, Membership
@@ -15,19 +16,23 @@ class CommentService:
         """
         queryset = Comment.objects.all()
         
-        # Add select_related for foreign keys
-        queryset = queryset.select_related('post', 'author', 'parent', 'post__community')
-        
-        # Add prefetch_related for reverse relations and many-to-many
-        queryset = queryset.prefetch_related(
-            'upvotes',
-            Prefetch(
-                'replies',
-                queryset=Comment.objects.select_related('author').prefetch_related('upvotes'),
-                to_attr='nested_replies'
-            )
+        # Add select_related for foreign keys, loading only the columns the serializer
+        # and the permission checks read rather than whole post/community rows
+        queryset = queryset.select_related('post__community', 'author').only(
+            'content', 'parent', 'created_at', 'updated_at', 'upvote_count_cache',
+            'author__username', 'author__email', 'author__first_name', 'author__last_name',
+            'post__community__creator', 'post__community__is_private',
         )
         
+        # Upvote counts come from upvote_count_cache and replies are listed through
+        # ?parent=, so only the requesting user's own upvote is prefetched, for has_upvoted
+        if user and user.is_authenticated:
+            queryset = queryset.prefetch_related(Prefetch(
+                'upvotes',
+                queryset=get_user_model().objects.filter(id=user.id).only('id'),
+                to_attr='_my_upvote'
+            ))
+        
         # Filter by post
         if post_id:
             queryset = queryset.filter(post_id=post_id)
@@ -43,12 +48,21 @@ class CommentService:
         if not user.is_authenticated:
             queryset = queryset.filter(post__community__is_private=False)
         else:
+            # EXISTS instead of joining the members M2M, so rows aren't
+            # multiplied per membership and need no DISTINCT
             queryset = queryset.filter(
-                Q(post__community__is_private=False) | 
-                Q(post__community__members=user)
-            ).distinct()
+                Q(post__community__is_private=False) |
+                Exists(Membership.objects.filter(
+                    community_id=OuterRef('post__community_id'),
+                    user=user
+                ))
+            )
         
-        return queryset
+        # Count replies in the same query instead of once per serialized comment.
+        # Meta.ordering is dropped from GROUP BY queries, so order explicitly for pagination
+        return queryset.annotate(
+            reply_count_ann=Count('replies')
+        ).order_by('created_at')
     
     @staticmethod
     def validate_comment_creation(user, post, parent_id=None):
@@ -95,7 +109,7 @@ class CommentService:
             return False, "You must be a member of this community to upvote comments."
         
         # Toggle upvote
-        if comment.upvotes.filter(id=user.id).exists():
+        if comment.is_upvoted_by(user):
             comment.upvotes.remove(user)
             return False, "Upvote removed."
         else:
@@ -1,21 +1,39 @@
+import re
+from datetime import timedelta
+from itertools import islice
+
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django.core.mail import send_mail
-from django.conf import settings
-from django.db.models import Q, Count, Prefetch
+from django.db.models import Q, Count, F, Exists, OuterRef, Case, When, Value, IntegerField
 from django.db.models.functions import TruncMonth, TruncDay
 from django.db import transaction, IntegrityError
 from django.core.cache import cache
 
-from ..models import Community, Membership, CommunityInvitation
-from ..utils.cache import cache_queryset, cached_method
+from ..models import Community, Membership, CommunityInvitation, Post, Comment
+from ..utils.cache import (
+    cache_queryset, cached_method, bump_revs,
+    community_rev_key, user_rev_key, COMMUNITY_LIST_REV_KEY
+)
+from ..utils.queries import count_subquery, sum_subquery
+from ..tasks import run_after_commit, send_invitation_emails
+
+
+# Invitations created (and emailed) per batch by bulk_invite_to_community
+INVITE_CHUNK_SIZE = 1000
+
+# How far back get_community_analytics reports its daily and monthly series
+ANALYTICS_DAILY_DAYS = 14
+ANALYTICS_MONTHLY_DAYS = 730
 
 
 class CommunityService:
     """Service class for community operations"""
     
     @staticmethod
-    @cache_queryset(timeout=60)  # Cache for 1 minute
+    @cache_queryset(  # Cache for 1 minute
+        timeout=60,
+        revs=lambda user, *args, **kwargs: (COMMUNITY_LIST_REV_KEY, user_rev_key(getattr(user, 'id', None)))
+    )
     def get_community_queryset(user, category=None, search=None, tag=None, member_of=None, order_by='created_at'):
         """
         Get a filtered queryset of communities based on parameters.
@@ -25,19 +43,18 @@ class CommunityService:
         
         queryset = Community.objects.all()
         
-        # Add select_related for foreign keys
-        queryset = queryset.select_related('creator')
-        
-        # Add prefetch_related for reverse relations and many-to-many
-        queryset = queryset.prefetch_related(
-            'members',
-            Prefetch(
-                'membership_set', 
-                queryset=Membership.objects.filter(status='approved').select_related('user'),
-                to_attr='active_memberships'
-            )
+        # Add select_related for foreign keys. Every community column is rendered,
+        # but of the creator only what UserBasicSerializer shows is loaded
+        queryset = queryset.select_related('creator').only(
+            *(field.attname for field in Community._meta.concrete_fields),
+            'creator__id', 'creator__username', 'creator__email',
+            'creator__first_name', 'creator__last_name'
         )
         
+        # Post counts for the whole page in the same query; member counts are
+        # already on the row as member_count_cache
+        queryset = queryset.annotate(post_count_ann=count_subquery(Post.objects.all(), 'community'))
+        
         # Filter by category
         if category:
             queryset = queryset.filter(category=category)
@@ -50,29 +67,28 @@ class CommunityService:
                 Q(tags__icontains=search)
             )
         
-        # Filter by tag - optimize by using Q objects for partial match
+        # Filter by tag - the icontains narrows rows through the trigram index,
+        # the regex then keeps only whole entries of the comma-separated list
         if tag:
             tag = tag.strip().lower()
-            # Match tags in comma-separated list with surrounding spaces/commas
             queryset = queryset.filter(
-                Q(tags__icontains=f", {tag},") | 
-                Q(tags__istartswith=f"{tag},") | 
-                Q(tags__iendswith=f", {tag}") |
-                Q(tags__exact=tag)
+                tags__icontains=tag,
+                tags__iregex=rf"(^|,)\s*{re.escape(tag)}\s*(,|$)"
             )
         
+        # Membership is checked with a correlated EXISTS (a semi-join), so rows
+        # never fan out through the members table and no DISTINCT is needed
+        is_member = Exists(Membership.objects.filter(community=OuterRef('pk'), user_id=user_id))
+        
         # Only show communities the user is a member of
         if member_of and user_id:
-            queryset = queryset.filter(members__id=user_id)
+            queryset = queryset.filter(is_member)
         
         # Only show public communities or communities the user is a member of
         if not user_id:
             queryset = queryset.filter(is_private=False)
-        else:
-            queryset = queryset.filter(
-                Q(is_private=False) | 
-                Q(members__id=user_id)
-            ).distinct()
+        elif not member_of:
+            queryset = queryset.filter(Q(is_private=False) | is_member)
         
         # Apply ordering
         if order_by == 'name':
@@ -91,29 +107,26 @@ class CommunityService:
         Handle joining a community with appropriate status based on community settings.
         Returns (created_membership, message)
         """
-        # Check if user is already a member
-        if Membership.objects.filter(user=user, community=community).exists():
+        # Check if community requires approval
+        status = 'pending' if community.requires_approval else 'approved'
+        
+        # Insert straight away and let the (user, community) unique constraint
+        # reject existing members: one round trip and no check-then-insert race.
+        # create() rather than bulk_create so the Membership signals still run
+        try:
+            with transaction.atomic():
+                membership = Membership.objects.create(
+                    user=user,
+                    community=community,
+                    role='member',
+                    status=status
+                )
+        except IntegrityError:
             return None, "You are already a member of this community."
         
-        # Check if community requires approval
-        if community.requires_approval:
-            # Create membership with pending status
-            membership = Membership.objects.create(
-                user=user,
-                community=community,
-                role='member',
-                status='pending'
-            )
+        if status == 'pending':
             return membership, "Join request submitted. An admin will review your request."
-        else:
-            # Direct join
-            membership = Membership.objects.create(
-                user=user,
-                community=community,
-                role='member',
-                status='approved'
-            )
-            return membership, "You have successfully joined this community."
+        return membership, "You have successfully joined this community."
     
     @staticmethod
     def leave_community(user, community):
@@ -139,47 +152,15 @@ class CommunityService:
         # Delete the membership
         membership.delete()
         
-        # More aggressive cache invalidation
-        # Delete user-specific membership caches
-        user_cache_keys = [
-            f"membership_status:{community.id}:{user.id}",
-            f"community_membership:{community.slug}:{user.id}",
-            f"post_creation_permission:{community.id}:{user.id}",
-            f"user_memberships:{user.id}",
-            f"user_admin_memberships:{user.id}"
-        ]
-        cache.delete_many(user_cache_keys)
-        
-        # Delete community-specific caches
-        community_cache_keys = [
-            f"community:members:{community.id}",
-            f"community:member_count:{community.id}",
-            f"community:posts:{community.id}",
-            f"community:posts:{community.slug}",
-            f"cache_queryset:CommunityService:get_community_queryset*"
-        ]
-        for key in community_cache_keys:
-            cache.delete_pattern(key)
-        
-        # Delete post-related caches for this community
-        cache.delete_pattern(f"post_list:{community.slug}:*")
-        cache.delete_pattern(f"cache_queryset:PostService:get_post_queryset:*community={community.slug}*")
-        
-        # Delete all specific post visibility caches for this user in this community
-        cache.delete_pattern(f"post_visibility:{community.id}:*:{user.id}")
-        
-        # Update community's member_count_cache
-        if community.member_count_cache and community.member_count_cache > 0:
-            Community.objects.filter(id=community.id).update(
-                member_count_cache=max(0, community.member_count_cache - 1)
-            )
-            
+        # The Membership post_delete signal clears this user's membership cache
+        # keys and bumps the revs that cached lists and analytics carry
+        # member_count_cache is recounted by the Membership post_delete signal
         return True, "You have successfully left this community."
     
     @staticmethod
     def invite_to_community(inviter, community, invitee_email, message=None, request=None):
         """
-        Create an invitation and send email.
+        Create an invitation and queue its email.
         Returns (success, message)
         """
         # Create invitation
@@ -191,37 +172,14 @@ class CommunityService:
             status='pending'
         )
         
-        # Prepare email if request object is provided (for build_absolute_uri)
+        # Queue the email if request object is provided (for build_absolute_uri)
         if request:
-            subject = f"Invitation to join {community.name} on Uni Hub"
-            email_message = f"""
-            Hello,
-            
-            {inviter.first_name} {inviter.last_name} has invited you to join the {community.name} community on Uni Hub.
-            
-            {invitation.message if invitation.message else ''}
-            
-            You can join this community by creating an account or logging in at:
-            {request.build_absolute_uri(f'/communities/{community.slug}')}
-            
-            Best regards,
-            Uni Hub Team
-            """
-            
-            try:
-                send_mail(
-                    subject,
-                    email_message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [invitation.invitee_email],
-                    fail_silently=False,
-                )
-                invitation.is_sent = True
-                invitation.sent_at = timezone.now()
-                invitation.save()
-                return True, "Invitation sent successfully."
-            except Exception as e:
-                return False, f"Invitation created but email could not be sent: {str(e)}"
+            run_after_commit(
+                send_invitation_emails,
+                [invitation.id],
+                request.build_absolute_uri(f'/communities/{community.slug}')
+            )
+            return True, "Invitation created, the email will be sent shortly."
         
         return True, "Invitation created successfully."
     
@@ -242,7 +200,7 @@ class CommunityService:
             return False, "User is not a member of this community."
         
         # Check if trying to change own role
-        if membership.user == current_user and new_role != 'admin':
+        if membership.user_id == current_user.id and new_role != 'admin':
             admin_count = Membership.objects.filter(
                 community=community, 
                 role='admin'
@@ -252,7 +210,7 @@ class CommunityService:
                 return False, "You cannot change your role as you are the only admin."
         
         membership.role = new_role
-        membership.save()
+        membership.save(update_fields=['role', 'updated_at'])
         
         return True, f"User role updated to {new_role}."
     
@@ -273,30 +231,31 @@ class CommunityService:
         
         if approve:
             membership.status = 'approved'
-            membership.save()
+            membership.save(update_fields=['status', 'updated_at'])
             return True, "Membership request approved."
         else:
             membership.status = 'rejected'
-            membership.save()
+            membership.save(update_fields=['status', 'updated_at'])
             return True, "Membership request rejected."
     
     @staticmethod
-    @cached_method(timeout=60)  # Cache for 1 minute
+    @cached_method(  # Cache for 1 minute
+        timeout=60,
+        revs=lambda community, *args, **kwargs: (community_rev_key(community.pk),)
+    )
     def get_community_members(community, role=None):
         """
         Get members of a community with optional role filtering.
         Returns queryset of Membership objects.
         """
         # Create a cache key specific to this community and role filter
-        # Base query with select_related for performance
+        # Join the user in the same query and only read the columns that
+        # MembershipSerializer renders, so a page of members is one SELECT
         memberships = Membership.objects.filter(community=community)
-        
-        # Use prefetch_related to optimize user related data
-        memberships = memberships.select_related('user', 'community')
-        memberships = memberships.prefetch_related(
-            Prefetch('user__created_communities', 
-                    queryset=Community.objects.only('id', 'name', 'slug'), 
-                    to_attr='prefetched_created_communities')
+        memberships = memberships.select_related('user').only(
+            'id', 'community_id', 'role', 'status', 'joined_at',
+            'user__id', 'user__username', 'user__email',
+            'user__first_name', 'user__last_name'
         )
         
         # Filter by role if specified
@@ -306,59 +265,141 @@ class CommunityService:
         # Filter by status (default to only approved members)
         memberships = memberships.filter(status='approved')
         
-        # Order by role importance then join date
-        return memberships.order_by(
-            # Admin first, then moderator, then member
-            '-role', 
-            'joined_at'
-        )
+        # Order by role importance then join date. '-role' sorted the strings,
+        # which put moderators ahead of admins; rank the roles explicitly
+        return memberships.annotate(
+            role_rank=Case(
+                # Admin first, then moderator, then member
+                When(role='admin', then=Value(0)),
+                When(role='moderator', then=Value(1)),
+                default=Value(2),
+                output_field=IntegerField()
+            )
+        ).order_by('role_rank', 'joined_at')
     
     @staticmethod
-    @cached_method(timeout=300)  # Cache for 5 minutes
+    @cached_method(  # Cache for 5 minutes
+        timeout=300,
+        revs=lambda community_id, *args, **kwargs: (community_rev_key(community_id),)
+    )
     def get_community_analytics(community_id):
         """
         Get analytics data for a community.
         This is a computationally expensive operation, so we cache it.
+        Every series is bounded in SQL, so its size doesn't grow with the
+        community's age.
         """
-        community = Community.objects.get(id=community_id)
-        
-        # Member growth analytics
-        member_growth = Membership.objects.filter(
-            community=community, 
-            status='approved'
-        ).annotate(
-            month=TruncMonth('joined_at')
-        ).values('month').annotate(count=Count('id')).order_by('month')
-        
-        # Post activity analytics
-        post_activity = community.posts.annotate(
-            day=TruncDay('created_at')
-        ).values('day').annotate(count=Count('id')).order_by('day')
+        # The totals ride along on the community fetch as correlated subqueries
+        # instead of a query (or a COUNT per post) each
+        community = Community.objects.annotate(
+            total_members=count_subquery(Membership.objects.filter(status='approved'), 'community'),
+            total_posts=count_subquery(Post.objects.all(), 'community'),
+            total_comments=count_subquery(Comment.objects.all(), 'post__community'),
+            total_upvotes=sum_subquery(Post.objects.all(), 'community', 'upvote_count_cache'),
+        ).get(id=community_id)
+        
+        now = timezone.now()
+        daily_since = now - timedelta(days=ANALYTICS_DAILY_DAYS)
+        monthly_since = now - timedelta(days=ANALYTICS_MONTHLY_DAYS)
+        members = Membership.objects.filter(community_id=community_id, status='approved')
+        posts = Post.objects.filter(community_id=community_id)
+        
+        def series(queryset, date_field, since, trunc, label):
+            rows = queryset.filter(**{f"{date_field}__gte": since}).annotate(
+                **{label: trunc(date_field)}
+            ).values(label).annotate(count=Count('id')).order_by(label)
+            return [{label: row[label].isoformat(), 'count': row['count']} for row in rows]
         
         # Top contributors (users with most posts)
-        top_contributors = community.posts.values(
-            'author__id', 'author__username', 'author__first_name', 'author__last_name'
+        top_contributors = posts.values(
+            'author_id', 'author__username', 'author__first_name', 'author__last_name'
         ).annotate(post_count=Count('id')).order_by('-post_count')[:10]
         
+        total_members = community.total_members
+        total_posts = community.total_posts
+        total_comments = community.total_comments
+        total_upvotes = community.total_upvotes
+        comments_per_post = round(total_comments / total_posts, 2) if total_posts > 0 else 0
+        upvotes_per_post = round(total_upvotes / total_posts, 2) if total_posts > 0 else 0
+        
         return {
-            'member_growth': list(member_growth),
-            'post_activity': list(post_activity),
-            'top_contributors': list(top_contributors),
-            'total_members': community.members.filter(membership__status='approved').count(),
-            'total_posts': community.posts.count(),
-            'total_comments': sum(post.comments.count() for post in community.posts.all()),
+            'member_growth': {
+                'daily': series(members, 'joined_at', daily_since, TruncDay, 'day'),
+                'monthly': series(members, 'joined_at', monthly_since, TruncMonth, 'month'),
+            },
+            'post_activity': {
+                'daily': series(posts, 'created_at', daily_since, TruncDay, 'day'),
+                'monthly': series(posts, 'created_at', monthly_since, TruncMonth, 'month'),
+            },
+            'engagement_stats': {
+                'total_members': total_members,
+                'total_posts': total_posts,
+                'total_comments': total_comments,
+                'total_upvotes': total_upvotes,
+                'posts_per_member': round(total_posts / total_members, 2) if total_members > 0 else 0,
+                'comments_per_post': comments_per_post,
+                'upvotes_per_post': upvotes_per_post,
+                'avg_upvotes_per_post': upvotes_per_post,
+                'avg_comments_per_post': comments_per_post,
+            },
+            'top_contributors': [
+                {
+                    'author_id': item['author_id'],
+                    'username': item['author__username'],
+                    'full_name': f"{item['author__first_name']} {item['author__last_name']}".strip(),
+                    'post_count': item['post_count']
+                }
+                for item in top_contributors
+            ],
         }
     
     @staticmethod
     def bulk_invite_to_community(inviter, community, invitee_emails, message=None, request=None):
         """
         Create multiple invitations at once for better performance.
-        Returns (success_count, failed_emails)
+        Emails that already have an invitation to this community are skipped.
+        Returns (queued_count, failed_emails)
         """
-        # Create all invitation objects in one go
-        invitations = []
-        for email in invitee_emails:
-            invitations.append(
+        join_url = request.build_absolute_uri(f'/communities/{community.slug}') if request else None
+        
+        # Work through the emails a chunk at a time so only one chunk of
+        # invitation objects is alive, and each email batch shares one SMTP connection
+        created_count = 0
+        failed_emails = []
+        # dict.fromkeys drops repeats in the request while keeping their order
+        emails = iter(dict.fromkeys(invitee_emails))
+        while chunk := list(islice(emails, INVITE_CHUNK_SIZE)):
+            created_invitations, skipped = CommunityService._create_invitations(
+                inviter, community, chunk, message
+            )
+            created_count += len(created_invitations)
+            failed_emails.extend(skipped)
+            
+            # Skip emails if request is not provided. Otherwise they go out in the
+            # background after commit; failures are logged there
+            if join_url:
+                run_after_commit(
+                    send_invitation_emails,
+                    [invitation.id for invitation in created_invitations],
+                    join_url
+                )
+        
+        return created_count, failed_emails
+    
+    @staticmethod
+    def _create_invitations(inviter, community, emails, message):
+        """
+        Insert invitations for the emails not invited to community yet.
+        Returns (created_invitations, skipped_emails)
+        """
+        # Filtering out existing invitations first keeps one duplicate from
+        # failing the whole INSERT, and unlike ignore_conflicts the created
+        # rows still come back with their ids for the email task
+        for attempt in range(2):
+            existing = set(CommunityInvitation.objects.filter(
+                community=community, invitee_email__in=emails
+            ).values_list('invitee_email', flat=True))
+            invitations = [
                 CommunityInvitation(
                     community=community,
                     inviter=inviter,
@@ -366,62 +407,16 @@ class CommunityService:
                     message=message or "",
                     status='pending'
                 )
-            )
-        
-        # Bulk create all invitations
-        created_invitations = CommunityInvitation.objects.bulk_create(invitations)
-        
-        # Skip emails if request is not provided
-        if not request:
-            return len(created_invitations), []
-            
-        # Prepare for bulk emailing
-        success_count = 0
-        failed_emails = []
-        
-        # Send emails
-        for invitation in created_invitations:
-            subject = f"Invitation to join {community.name} on Uni Hub"
-            email_message = f"""
-            Hello,
-            
-            {inviter.first_name} {inviter.last_name} has invited you to join the {community.name} community on Uni Hub.
-            
-            {invitation.message if invitation.message else ''}
-            
-            You can join this community by creating an account or logging in at:
-            {request.build_absolute_uri(f'/communities/{community.slug}')}
-            
-            Best regards,
-            Uni Hub Team
-            """
-            
+                for email in emails if email not in existing
+            ]
             try:
-                from django.core.mail import send_mail
-                from django.conf import settings
-                
-                send_mail(
-                    subject,
-                    email_message,
-                    settings.DEFAULT_FROM_EMAIL,
-                    [invitation.invitee_email],
-                    fail_silently=True,
-                )
-                
-                # Mark as sent
-                invitation.is_sent = True
-                invitation.sent_at = timezone.now()
-                success_count += 1
-            except Exception:
-                failed_emails.append(invitation.invitee_email)
-                
-        # Bulk update the sent status
-        CommunityInvitation.objects.bulk_update(
-            created_invitations, 
-            ['is_sent', 'sent_at']
-        )
-        
-        return success_count, failed_emails
+                with transaction.atomic():
+                    created = CommunityInvitation.objects.bulk_create(invitations, batch_size=500)
+                return created, [email for email in emails if email in existing]
+            except IntegrityError:
+                # A concurrent invite took one of the emails; look again once
+                if attempt:
+                    raise
         
     @staticmethod
     def bulk_handle_membership_requests(community, user_ids, approve=True):
@@ -436,76 +431,100 @@ class CommunityService:
             status='pending'
         )
         
-        # No memberships found
-        if not memberships:
-            return 0, len(user_ids)
-            
-        # Update all at once
+        # Update all at once; the row count tells us if nothing matched.
+        # The member count moves in the same transaction, from the database
+        # rather than a possibly stale instance
         new_status = 'approved' if approve else 'rejected'
-        count = memberships.update(status=new_status)
+        with transaction.atomic():
+            count = memberships.update(status=new_status)
+            if count and approve:
+                Community.objects.filter(id=community.id).update(
+                    member_count_cache=F('member_count_cache') + count
+                )
+        if not count:
+            return 0, len(user_ids)
         
-        # Clear membership caches
-        cache.delete_many([f"membership_status:{community.id}:{user_id}" for user_id in user_ids])
-            
-        # Also update member count cache if approving
-        if approve:
-            current_count = community.member_count_cache or 0
-            Community.objects.filter(id=community.id).update(
-                member_count_cache=current_count + count
-            )
+        # QuerySet.update() skips the Membership signals, so do their cache
+        # invalidation here once the update is committed: one DEL for every
+        # point key and one pipeline for all the revs, rather than a round
+        # trip per user
+        cache_keys = [
+            key
+            for user_id in user_ids
+            for key in Membership.user_cache_keys(community, user_id)
+        ]
+        rev_keys = [community_rev_key(community.id), COMMUNITY_LIST_REV_KEY, *map(user_rev_key, user_ids)]
+        
+        def invalidate():
+            cache.delete_many(cache_keys)
+            bump_revs(rev_keys)
+        
+        transaction.on_commit(invalidate)
             
         return count, len(user_ids) - count 
     
     @staticmethod
     def update_community_with_lock(community_id, update_data, user):
         """
-        Update a community with optimistic locking to prevent race conditions.
+        Update a community under a short row lock.
+        The permission check reads without a lock; only the re-fetch, field
+        updates and save hold SELECT ... FOR UPDATE, so concurrent edits are
+        still serialized but the lock doesn't cover the permission queries.
         Returns (updated_community, error_message)
         """
-        # Start a transaction
-        with transaction.atomic():
-            # Get the community with a lock for update
-            try:
-                community = Community.objects.select_for_update().get(id=community_id)
-            except Community.DoesNotExist:
-                return None, "Community not found."
-                
-            # Check permissions
-            if community.creator.id != user.id:
-                # Check if user is an admin
+        try:
+            creator_id = Community.objects.values_list('creator_id', flat=True).get(id=community_id)
+        except Community.DoesNotExist:
+            return None, "Community not found."
+            
+        # Check permissions
+        if creator_id != user.id:
+            # Check if user is an admin
+            if not Membership.objects.filter(
+                community_id=community_id,
+                user=user,
+                role='admin'
+            ).exists():
+                return None, "You don't have permission to update this community."
+        
+        try:
+            with transaction.atomic():
+                # Get the community with a lock for update
                 try:
-                    membership = Membership.objects.get(
-                        community=community,
-                        user=user,
-                        role='admin'
-                    )
-                except Membership.DoesNotExist:
-                    return None, "You don't have permission to update this community."
-                    
-            # Update fields
-            for field, value in update_data.items():
-                if field in ['name', 'description', 'short_description', 'category', 
-                            'tags', 'rules', 'is_private', 'requires_approval']:
-                    setattr(community, field, value)
-                    
-            # Special handling for image and banner (file uploads)
-            if 'image' in update_data and update_data['image'] is not None:
-                community.image = update_data['image']
+                    community = Community.objects.select_for_update().get(id=community_id)
+                except Community.DoesNotExist:
+                    return None, "Community not found."
                 
-            if 'banner' in update_data and update_data['banner'] is not None:
-                community.banner = update_data['banner']
+                # Update fields, remembering which ones so only those are written
+                changed = {'updated_at'}
+                for field, value in update_data.items():
+                    if field in ['name', 'description', 'short_description', 'category', 
+                                'tags', 'rules', 'is_private', 'requires_approval']:
+                        setattr(community, field, value)
+                        changed.add(field)
+                        
+                # Special handling for image and banner (file uploads)
+                if 'image' in update_data and update_data['image'] is not None:
+                    community.image = update_data['image']
+                    changed.add('image')
+                    
+                if 'banner' in update_data and update_data['banner'] is not None:
+                    community.banner = update_data['banner']
+                    changed.add('banner')
                 
-            # Save changes
-            try:
-                community.save()
-                # Clear cache for this community
-                cache.delete(f"community:slug:{community.slug}")
-                return community, None
-            except IntegrityError as e:
-                # Handle uniqueness constraints
-                if 'communities_community_name_key' in str(e):
-                    return None, "A community with this name already exists."
-                # Other integrity errors
-                return None, f"Database error: {str(e)}"
-            except Exception as e:
-                return None, f"Error updating community: {str(e)}" 
\ No newline at end of file
+                # Community.save() fills an empty short_description from the description
+                if 'description' in changed:
+                    changed.add('short_description')
+                    
+                # Save changes; the post_save signal clears the slug cache and
+                # bumps the community rev once this commits
+                community.save(update_fields=list(changed))
+            return community, None
+        except IntegrityError as e:
+            # Handle uniqueness constraints
+            if 'communities_community_name_key' in str(e):
+                return None, "A community with this name already exists."
+            # Other integrity errors
+            return None, f"Database error: {str(e)}"
+        except Exception as e:
+            return None, f"Error updating community: {str(e)}" 
\ No newline at end of file
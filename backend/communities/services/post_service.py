@@ -1,85 +1,68 @@
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Prefetch
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, F, OuterRef, Q, Prefetch
+from django.db.models.functions import Greatest
 from rest_framework.exceptions import PermissionDenied
 from django.core.cache import cache
-import logging
+from django.db import transaction
 
-from ..models import Community, Membership, Post, Comment
+from ..models import Membership, Post, Comment
+from ..utils.cache import bump_community_rev
 
 
 class PostService:
     """Service class for post operations"""
     
     @staticmethod
-    def get_post_queryset(user, community_slug=None, post_type=None, search=None):
+    def get_post_queryset(user, community_slug=None, post_type=None, search=None, with_comments=False):
         """
         Get a filtered queryset of posts based on parameters.
+        with_comments prefetches each post's top-level comments into _top_comments.
         """
-        logger = logging.getLogger(__name__)
-        
         queryset = Post.objects.all()
         
-        # Add select_related for foreign keys
-        queryset = queryset.select_related('community', 'author')
-        
-        # Add prefetch_related for reverse relations and many-to-many
-        queryset = queryset.prefetch_related(
-            'upvotes',
-            Prefetch(
-                'comments',
-                queryset=Comment.objects.filter(parent=None).select_related('author'),
-                to_attr='top_level_comments'
-            )
+        # Add select_related for foreign keys. Every post column is serialized, but
+        # of the joined rows only the author fields and the community columns the
+        # visibility and permission checks read are loaded, not whole rows
+        queryset = queryset.select_related('community', 'author').only(
+            'title', 'content', 'post_type', 'tags', 'visibility', 'event_date', 'event_location',
+            'image', 'file', 'is_pinned', 'created_at', 'updated_at',
+            'upvote_count_cache', 'comment_count_cache',
+            'author__username', 'author__email', 'author__first_name', 'author__last_name',
+            'community__creator', 'community__is_private',
         )
         
+        # has_upvoted is an EXISTS on the upvotes through table in the same query;
+        # upvote counts come from upvote_count_cache, so no upvoters are loaded
+        if user and user.is_authenticated:
+            queryset = queryset.annotate(has_upvoted_ann=Exists(
+                Post.upvotes.through.objects.filter(post_id=OuterRef('pk'), user_id=user.id)
+            ))
+        
+        # Newest top-level comments for the detail view, with the same reply counts,
+        # author columns and per-user upvote prefetch as the comment list endpoint.
+        # The slice becomes a ROW_NUMBER() window per post, so at most
+        # PREVIEW_COMMENTS rows per post are fetched
+        if with_comments:
+            comments = Comment.objects.filter(parent=None).select_related('author').only(
+                'content', 'parent', 'post', 'created_at', 'updated_at', 'upvote_count_cache',
+                'author__username', 'author__email', 'author__first_name', 'author__last_name',
+            ).annotate(
+                reply_count_ann=Count('replies')
+            ).order_by('-created_at')
+            if user and user.is_authenticated:
+                comments = comments.prefetch_related(Prefetch(
+                    'upvotes',
+                    queryset=get_user_model().objects.filter(id=user.id).only('id'),
+                    to_attr='_my_upvote'
+                ))
+            queryset = queryset.prefetch_related(Prefetch(
+                'comments', queryset=comments[:Post.PREVIEW_COMMENTS], to_attr='_top_comments'
+            ))
+        
         # Filter by community
         if community_slug:
             queryset = queryset.filter(community__slug=community_slug)
-            
-            # Debug logging
-            try:
-                logger.info(f"Post visibility debug for community '{community_slug}':")
-                is_authenticated = user.is_authenticated if user else False
-                logger.info(f"User is authenticated: {is_authenticated}")
-                
-                if is_authenticated:
-                    # Check cache for membership status
-                    cache_key = f"community_membership:{community_slug}:{user.id}"
-                    membership_info = cache.get(cache_key)
-                    
-                    if membership_info is None:
-                        # Not in cache, query database
-                        is_member = Membership.objects.filter(
-                            user=user,
-                            community__slug=community_slug,
-                            status='approved'
-                        ).exists()
-                        
-                        is_admin = Membership.objects.filter(
-                            user=user,
-                            community__slug=community_slug,
-                            status='approved',
-                            role='admin'
-                        ).exists()
-                        
-                        # Cache the result (shorter timeout to avoid stale data)
-                        membership_info = {'is_member': is_member, 'is_admin': is_admin}
-                        cache.set(cache_key, membership_info, 180)  # 3 minute cache
-                    else:
-                        is_member = membership_info.get('is_member', False)
-                        is_admin = membership_info.get('is_admin', False)
-                    
-                    logger.info(f"User is member: {is_member}, is admin: {is_admin}")
-                    
-                    # Count posts by visibility
-                    total_posts = Post.objects.filter(community__slug=community_slug).count()
-                    public_posts = Post.objects.filter(community__slug=community_slug, visibility='public').count()
-                    member_posts = Post.objects.filter(community__slug=community_slug, visibility='members').count()
-                    admin_posts = Post.objects.filter(community__slug=community_slug, visibility='admin').count()
-                    
-                    logger.info(f"Post counts - Total: {total_posts}, Public: {public_posts}, Members: {member_posts}, Admin: {admin_posts}")
-            except Exception as e:
-                logger.error(f"Error in visibility debug logging: {str(e)}")
         
         # Filter by post type
         if post_type:
@@ -100,62 +83,14 @@ class PostService:
                 visibility='public'
             )
         else:
-            # Get a list of communities where the user is an approved member
-            # Check cache first
-            cache_key = f"user_memberships:{user.id}"
-            member_communities = cache.get(cache_key)
-            
-            if member_communities is None:
-                member_communities = list(Membership.objects.filter(
-                    user=user,
-                    status='approved'
-                ).values_list('community_id', flat=True))
-                
-                # Cache for a short time
-                cache.set(cache_key, member_communities, 180)  # 3 minute cache
-            
-            # Get a list of communities where the user is an admin
-            cache_key = f"user_admin_memberships:{user.id}"
-            admin_communities = cache.get(cache_key)
-            
-            if admin_communities is None:
-                admin_communities = list(Membership.objects.filter(
-                    user=user,
-                    status='approved',
-                    role='admin'
-                ).values_list('community_id', flat=True))
-                
-                # Cache for a short time
-                cache.set(cache_key, admin_communities, 180)  # 3 minute cache
-            
-            # Always double-check membership for a specific community slug if provided
-            # This ensures we don't rely solely on cached data that might be stale
-            if community_slug:
-                # Get the community ID
-                community = Community.get_by_slug(community_slug)
-                if community:
-                    # Verify actual membership in database if this is a specific community query
-                    is_member = Membership.objects.filter(
-                        user=user,
-                        community_id=community.id,
-                        status='approved'
-                    ).exists()
-                    
-                    # If there's a discrepancy between cache and actual membership,
-                    # update our working lists and invalidate the cache
-                    if is_member and community.id not in member_communities:
-                        member_communities.append(community.id)
-                        cache.delete(f"user_memberships:{user.id}")
-                    elif not is_member and community.id in member_communities:
-                        # Remove from our working list
-                        if community.id in member_communities:
-                            member_communities.remove(community.id)
-                        # Also remove from admin communities if present
-                        if community.id in admin_communities:
-                            admin_communities.remove(community.id)
-                        # Invalidate caches
-                        cache.delete(f"user_memberships:{user.id}")
-                        cache.delete(f"user_admin_memberships:{user.id}")
+            # Membership is checked per row with correlated EXISTS lookups on the
+            # (user, community) index, instead of shipping the user's community
+            # ids as IN lists; nothing joins, so no DISTINCT is needed either
+            memberships = Membership.objects.filter(
+                user_id=user.id,
+                community_id=OuterRef('community_id'),
+                status='approved'
+            )
             
             # For non-private communities, show public posts (regardless of membership)
             public_communities_posts = Q(
@@ -165,31 +100,20 @@ class PostService:
             
             # For communities the user is a member of, show public and members-only posts
             member_communities_posts = Q(
-                community_id__in=member_communities,
+                Exists(memberships),
                 visibility__in=['public', 'members']
             )
             
             # For communities where the user is an admin, show all posts
-            admin_communities_posts = Q(
-                community_id__in=admin_communities
-            )
+            admin_communities_posts = Q(Exists(memberships.filter(role='admin')))
             
             # Combine filters for final query
             queryset = queryset.filter(
                 public_communities_posts | member_communities_posts | admin_communities_posts
-            ).distinct()
+            )
         
         # Default ordering
-        filtered_queryset = queryset.order_by('-is_pinned', '-created_at')
-        
-        # Log the final count for debugging
-        if community_slug:
-            try:
-                logger.info(f"Final filtered post count: {filtered_queryset.count()}")
-            except Exception as e:
-                logger.error(f"Error getting final post count: {str(e)}")
-        
-        return filtered_queryset
+        return queryset.order_by('-is_pinned', '-created_at')
     
     @staticmethod
     def validate_post_creation(user, community):
@@ -207,8 +131,8 @@ class PostService:
                 raise PermissionDenied("You must be a member of this community to post.")
             return True, cached_result
             
-        # If user is the creator
-        if community.creator == user or community.creator_id == user.id:
+        # If user is the creator (compare ids so the creator row is never loaded)
+        if community.creator_id == user.id:
             # Ensure creator has admin membership
             membership, created = Membership.objects.get_or_create(
                 user=user,
@@ -221,8 +145,11 @@ class PostService:
         
         # If user is a member
         try:
-            # Use more efficient query with index
-            membership = Membership.objects.select_related('user', 'community').get(
+            # User and community are already in hand, so neither is joined; only
+            # the membership's own columns are read and cached
+            membership = Membership.objects.only(
+                'id', 'user_id', 'community_id', 'role', 'status'
+            ).get(
                 user_id=user.id, 
                 community_id=community.id,
                 status='approved'
@@ -261,18 +188,18 @@ class PostService:
         if not (is_member or is_creator):
             return False, "You must be a member of this community to upvote posts."
         
-        # Toggle upvote
-        if post.upvotes.filter(id=user.id).exists():
-            post.upvotes.remove(user)
-            # Update cache
-            post.upvote_count_cache = max(0, post.upvote_count_cache - 1)
-            post.save(update_fields=['upvote_count_cache'])
+        # Toggle upvote. Deleting the through row reports whether there was one,
+        # so no separate existence check is needed; exactly one row went away,
+        # so the counter takes a -1 in SQL rather than a recount
+        removed, _ = Post.upvotes.through.objects.filter(post_id=post.id, user_id=user.id).delete()
+        if removed:
+            Post.objects.filter(id=post.id).update(
+                upvote_count_cache=Greatest(F('upvote_count_cache') - 1, 0)
+            )
             return False, "Upvote removed."
         else:
+            # The m2m_changed signal adds the new upvote to the counter
             post.upvotes.add(user)
-            # Update cache
-            post.upvote_count_cache = post.upvote_count_cache + 1
-            post.save(update_fields=['upvote_count_cache'])
             return True, "Post upvoted."
     
     @staticmethod
@@ -313,7 +240,27 @@ class PostService:
             )
             posts.append(post)
         
-        # Bulk create posts
-        created_posts = Post.objects.bulk_create(posts)
+        # Bulk create posts in batches. created_at is filled in Python by
+        # auto_now_add and bulk_create fires no post_save, so the counter
+        # columns keep their zero defaults without any per-post statement
+        created_posts = Post.objects.bulk_create(posts, batch_size=500)
+        
+        # Without post_save, invalidate what Post.save() would have once this commits
+        community_id = community.id
+        
+        def invalidate():
+            cache.delete_many([
+                f"community:post_count:{community_id}",
+                f"community:recent_posts:{community_id}",
+            ])
+            bump_community_rev(community_id)
+        
+        if created_posts:
+            transaction.on_commit(invalidate)
+        
+        # Nobody has upvoted a post that was just created, so serializing the
+        # batch doesn't need a has_upvoted query per post
+        for post in created_posts:
+            post.has_upvoted_ann = False
         
         return created_posts 
\ No newline at end of file
@@ -1,27 +1,74 @@
+import threading
+
 from django.db.models.signals import post_save, post_delete, m2m_changed
 from django.dispatch import receiver
-from django.db import models
-from django.db.models import Count
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.functions import Greatest
 from django.core.cache import cache
 
 from .models import Community, Membership, Post, Comment
+from .utils.cache import (
+    COMMUNITY_LIST_REV_KEY, bump_community_rev, bump_revs, community_rev_key,
+    user_rev_key,
+)
+from .utils.queries import count_subquery
 
 
 @receiver(post_save, sender=Community)
 def invalidate_community_cache(sender, instance, **kwargs):
-    """Invalidate cache for community by slug when it's updated"""
-    # Clear the cached community lookup by slug
-    cache_key = f"community:slug:{instance.slug}"
-    cache.delete(cache_key)
+    """Invalidate cache for community by slug once the update is committed"""
+    community_id = instance.id
+    # Clear the cached community lookup by slug and related serializer cache keys
+    cache_keys = Community.slug_cache_keys(instance.slug) + [
+        f"community:post_count:{community_id}",
+        f"community:recent_posts:{community_id}",
+        f"community:admins:{community_id}",
+    ]
+    
+    def invalidate():
+        cache.delete_many(cache_keys)
+        # Also retire cached community lists, member lists and analytics
+        bump_community_rev(community_id)
+    
+    # Deleting before commit would let a concurrent read re-cache the old row
+    # under the new revision; outside a transaction this runs straight away
+    transaction.on_commit(invalidate)
+
+
+# Communities whose member_count_cache must be recounted, and the users and
+# membership keys to invalidate, when the current transaction commits, per
+# thread (each thread has its own connection)
+_pending_member_counts = threading.local()
+
+
+def _flush_member_counts():
+    """Recount every community queued since the last flush with one UPDATE"""
+    community_ids = getattr(_pending_member_counts, 'ids', None)
+    if not community_ids:
+        return
+    user_ids = _pending_member_counts.user_ids
+    cache_keys = _pending_member_counts.cache_keys
+    _pending_member_counts.ids = set()
+    _pending_member_counts.user_ids = set()
+    _pending_member_counts.cache_keys = set()
     
-    # Clear related serializer cache keys
-    cache.delete(f"community:post_count:{instance.id}")
-    cache.delete(f"community:recent_posts:{instance.id}")
-    cache.delete(f"community:admins:{instance.id}")
+    # The count is a subquery of the same UPDATE, so no value read in Python
+    # can be written back stale
+    Community.objects.filter(id__in=community_ids).update(
+        member_count_cache=count_subquery(Membership.objects.filter(status='approved'), 'community')
+    )
+    # Retire cached community lists and member lists now that the counts landed,
+    # and the users' cached results; everything derived from their memberships
+    # is keyed on their revision, so nothing has to be scanned for
+    bump_revs(
+        [community_rev_key(community_id) for community_id in community_ids]
+        + [COMMUNITY_LIST_REV_KEY]
+        + [user_rev_key(user_id) for user_id in user_ids]
+    )
     
-    # Also clear any cached community-related querysets
-    cache.delete_pattern("cache_queryset:CommunityService:get_community_queryset*")
-    cache.delete_pattern(f"cached_method:*:get_community_members*{instance.id}*")
+    # Clear post visibility and community membership status cache keys
+    cache.delete_many(list(cache_keys))
 
 
 @receiver(post_save, sender=Membership)
@@ -29,90 +76,138 @@ def invalidate_community_cache(sender, instance, **kwargs):
 def update_community_member_count(sender, instance, **kwargs):
     """Update the member count cache when a membership is created, updated or deleted"""
     community = instance.community
-    user = instance.user
-    
-    # Use update to avoid triggering other signals
-    Community.objects.filter(id=community.id).update(
-        member_count_cache=Membership.objects.filter(
-            community=community,
-            status='approved'
-        ).count()
-    )
-    
-    # Clear cached members list
-    cache_key = f"cached_method:CommunityService:get_community_members:{community.id}"
-    cache.delete_pattern(f"{cache_key}*")
-    
-    # Clear post visibility cache keys
-    cache.delete(f"membership_status:{community.id}:{user.id}")
-    cache.delete(f"post_creation_permission:{community.id}:{user.id}")
-    
-    # Clear cached post querysets for this user and community
-    cache.delete_pattern(f"cache_queryset:PostService:get_post_queryset:*user={user.id}*community={community.slug}*")
-    
-    # Clear community membership status cache
-    cache.delete(f"community_membership:{community.slug}:{user.id}")
+    user_id = instance.user_id
     
-    # Force refresh any cached post lists
-    cache.delete_pattern(f"post_list:{community.slug}:*")
+    # Memberships saved in one transaction share a single recount and
+    # invalidation at commit, so a concurrent read can't re-cache the old
+    # state; outside a transaction on_commit runs it straight away. The
+    # callback is registered every time so a rolled back savepoint can't drop
+    # the only one
+    if not hasattr(_pending_member_counts, 'ids'):
+        _pending_member_counts.ids = set()
+        _pending_member_counts.user_ids = set()
+        _pending_member_counts.cache_keys = set()
+    _pending_member_counts.ids.add(community.id)
+    _pending_member_counts.user_ids.add(user_id)
+    _pending_member_counts.cache_keys.update(Membership.user_cache_keys(community, user_id))
+    transaction.on_commit(_flush_member_counts)
 
 
 @receiver(post_save, sender=Comment)
+def increment_post_comment_count(sender, instance, created, **kwargs):
+    """Bump the comment count cache when a comment is created"""
+    if created:
+        # Use update to avoid triggering other signals
+        Post.objects.filter(id=instance.post_id).update(
+            comment_count_cache=F('comment_count_cache') + 1
+        )
+
+
 @receiver(post_delete, sender=Comment)
-def update_post_comment_count(sender, instance, **kwargs):
-    """Update the comment count cache when a comment is created, updated or deleted"""
-    post = instance.post
-    # Use update to avoid triggering other signals
-    Post.objects.filter(id=post.id).update(
-        comment_count_cache=Comment.objects.filter(post=post).count()
+def decrement_post_comment_count(sender, instance, **kwargs):
+    """Drop the comment count cache when a comment is deleted"""
+    Post.objects.filter(id=instance.post_id).update(
+        comment_count_cache=Greatest(F('comment_count_cache') - 1, 0)
     )
 
 
+def sync_upvote_count(model, instance, action, pk_set, reverse):
+    """
+    Keep upvote_count_cache in step with an upvotes M2M change.
+    post_add only reports rows that were actually inserted, so it is applied as a
+    delta; removals may name rows that never existed, so those recount inside
+    the UPDATE itself. A reverse change (user.upvoted_posts.add(...)) names the
+    posts or comments in pk_set, so those rows are recounted instead.
+    """
+    through = model.upvotes.through
+    upvote_count = count_subquery(through.objects.all(), model._meta.model_name)
+    if reverse:
+        if action == 'pre_clear':
+            # post_clear has no pk_set and the rows are gone by then, so note
+            # what the user had upvoted while it can still be read
+            instance._cleared_upvote_ids = list(
+                through.objects.filter(user=instance).values_list(f'{model._meta.model_name}_id', flat=True)
+            )
+        elif action == 'post_clear':
+            pk_set = instance.__dict__.pop('_cleared_upvote_ids', None)
+        if action in ('post_add', 'post_remove', 'post_clear') and pk_set:
+            model.objects.filter(id__in=pk_set).update(upvote_count_cache=upvote_count)
+    elif action == 'post_add' and pk_set:
+        model.objects.filter(id=instance.id).update(
+            upvote_count_cache=F('upvote_count_cache') + len(pk_set)
+        )
+    elif action in ('post_remove', 'post_clear'):
+        model.objects.filter(id=instance.id).update(upvote_count_cache=upvote_count)
+
+
 @receiver(m2m_changed, sender=Post.upvotes.through)
-def update_post_upvote_count(sender, instance, action, **kwargs):
+def update_post_upvote_count(sender, instance, action, pk_set, reverse, **kwargs):
     """Update the upvote count cache when the post upvotes M2M is changed"""
-    if action in ('post_add', 'post_remove', 'post_clear'):
-        # Only update on changes
-        Post.objects.filter(id=instance.id).update(
-            upvote_count_cache=instance.upvotes.count()
-        )
+    sync_upvote_count(Post, instance, action, pk_set, reverse)
 
 
 @receiver(m2m_changed, sender=Comment.upvotes.through)
-def update_comment_upvote_count(sender, instance, action, **kwargs):
+def update_comment_upvote_count(sender, instance, action, pk_set, reverse, **kwargs):
     """Update the upvote count cache when the comment upvotes M2M is changed"""
-    if action in ('post_add', 'post_remove', 'post_clear'):
-        # Only update on changes
-        Comment.objects.filter(id=instance.id).update(
-            upvote_count_cache=instance.upvotes.count()
-        )
+    sync_upvote_count(Comment, instance, action, pk_set, reverse)
+
+
+def update_in_batches(queryset, batch_size=None, **values):
+    """
+    Run queryset.update(**values), optionally split into primary key ranges of
+    batch_size so each UPDATE (and its row locks) stays small. Returns rows updated.
+    """
+    if not batch_size:
+        return queryset.update(**values)
+    bounds = queryset.model.objects.aggregate(low=models.Min('pk'), high=models.Max('pk'))
+    if bounds['low'] is None:
+        return 0
+    updated = 0
+    for start in range(bounds['low'], bounds['high'] + 1, batch_size):
+        updated += queryset.filter(pk__gte=start, pk__lt=start + batch_size).update(**values)
+    return updated
+
+
+# Each rebuild is an UPDATE ... SET col = (SELECT COUNT(*) ...) statement, run
+# over the whole table or per batch_size primary key range.
+# Rows whose counter is already right are excluded, so a routine run on a large
+# table only writes (and leaves dead tuples for) the rows that drifted.
+def update_community_member_counts(batch_size=None):
+    """Recompute member_count_cache where it drifted, returns rows updated"""
+    member_count = count_subquery(Membership.objects.filter(status='approved'), 'community')
+    return update_in_batches(
+        Community.objects.exclude(member_count_cache=member_count),
+        batch_size,
+        member_count_cache=member_count
+    )
+
+
+def update_post_counts(batch_size=None):
+    """Recompute comment_count_cache and upvote_count_cache where they drifted, returns rows updated"""
+    comment_count = count_subquery(Comment.objects.all(), 'post')
+    upvote_count = count_subquery(Post.upvotes.through.objects.all(), 'post')
+    return update_in_batches(
+        Post.objects.exclude(comment_count_cache=comment_count, upvote_count_cache=upvote_count),
+        batch_size,
+        comment_count_cache=comment_count,
+        upvote_count_cache=upvote_count
+    )
+
+
+def update_comment_upvote_counts(batch_size=None):
+    """Recompute upvote_count_cache where it drifted, returns rows updated"""
+    upvote_count = count_subquery(Comment.upvotes.through.objects.all(), 'comment')
+    return update_in_batches(
+        Comment.objects.exclude(upvote_count_cache=upvote_count),
+        batch_size,
+        upvote_count_cache=upvote_count
+    )
 
 
 # Batch update function for maintenance or migrations
 def update_all_cache_counts():
     """Update all cache counters in the database"""
-    
-    # Update community member counts
-    communities = Community.objects.all()
-    for community in communities:
-        Community.objects.filter(id=community.id).update(
-            member_count_cache=Membership.objects.filter(
-                community=community,
-                status='approved'
-            ).count()
-        )
-    
-    # Update post comment counts
-    posts = Post.objects.all()
-    for post in posts:
-        Post.objects.filter(id=post.id).update(
-            comment_count_cache=Comment.objects.filter(post=post).count(),
-            upvote_count_cache=post.upvotes.count()
-        )
-    
-    # Update comment upvote counts
-    comments = Comment.objects.all()
-    for comment in comments:
-        Comment.objects.filter(id=comment.id).update(
-            upvote_count_cache=comment.upvotes.count()
-        ) 
\ No newline at end of file
+    with transaction.atomic():
+        update_community_member_counts()
+        update_post_counts()
+        update_comment_upvote_counts()
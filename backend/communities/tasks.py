@@ -0,0 +1,89 @@
+"""
+Background tasks for the communities app.
+
+The deployment has no task queue, so tasks run on a small in-process thread
+pool once the surrounding transaction commits. The request returns without
+waiting on SMTP, but tasks still queued in the pool (such as invitation
+emails) are lost if the worker process restarts.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import CommunityInvitation
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='communities-tasks')
+
+
+def _run(func, *args):
+    try:
+        func(*args)
+    except Exception:
+        logger.exception("Background task %s failed", func.__name__)
+    finally:
+        # Each worker thread has its own database connection
+        connection.close()
+
+
+def run_after_commit(func, *args):
+    """Run func(*args) in the background once the current transaction commits"""
+    transaction.on_commit(lambda: _executor.submit(_run, func, *args))
+
+
+def build_invitation_email(invitation, join_url):
+    """Return (subject, body) of the email for an invitation"""
+    community = invitation.community
+    inviter = invitation.inviter
+    subject = f"Invitation to join {community.name} on Uni Hub"
+    body = f"""
+            Hello,
+
+            {inviter.first_name} {inviter.last_name} has invited you to join the {community.name} community on Uni Hub.
+
+            {invitation.message if invitation.message else ''}
+
+            You can join this community by creating an account or logging in at:
+            {join_url}
+
+            Best regards,
+            Uni Hub Team
+            """
+    return subject, body
+
+
+def send_invitation_emails(invitation_ids, join_url):
+    """Email the given invitations and mark the ones that went out as sent"""
+    invitations = CommunityInvitation.objects.filter(
+        id__in=invitation_ids
+    ).select_related('community', 'inviter')
+
+    sent_ids = []
+    # A bulk invite shares one community, inviter and message, so the email is
+    # built once per distinct combination rather than once per recipient
+    emails = {}
+    # One SMTP connection for the whole batch instead of a handshake per email;
+    # messages still go one at a time so each invitation knows if it was sent
+    with get_connection(fail_silently=True) as mail_connection:
+        for invitation in invitations:
+            email_key = (invitation.community_id, invitation.inviter_id, invitation.message)
+            if email_key not in emails:
+                emails[email_key] = build_invitation_email(invitation, join_url)
+            subject, body = emails[email_key]
+            message = EmailMessage(
+                subject,
+                body,
+                settings.DEFAULT_FROM_EMAIL,
+                [invitation.invitee_email],
+                connection=mail_connection,
+            )
+            if mail_connection.send_messages([message]):
+                sent_ids.append(invitation.id)
+
+    # One UPDATE for the whole batch
+    CommunityInvitation.objects.filter(id__in=sent_ids).update(is_sent=True, sent_at=timezone.now())
@@ -1,10 +1,16 @@
+from django.db import connection, transaction
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.urls import reverse
 from rest_framework import status
-from rest_framework.test import APITestCase, APIClient
+from rest_framework.test import APITestCase, APIClient, APIRequestFactory
 
 from .models import Community, Membership, Post, Comment
+from .serializers import PostSerializer
+from .services.post_service import PostService
+from .signals import update_comment_upvote_counts, update_post_counts
 
 
 User = get_user_model()
@@ -148,10 +154,14 @@ class PostTests(APITestCase):
     """Test post-related functionality"""
     
     def setUp(self):
+        cache.clear()
+        
         # Create test users
         self.user = User.objects.create_user(
             username='testuser',
             email='test@example.com',
+            first_name='Test',
+            last_name='User',
             password='testpass123'
         )
         
@@ -189,11 +199,13 @@ class PostTests(APITestCase):
     def test_list_posts(self):
         """Test listing posts in a community"""
         url = reverse('community-posts-list', kwargs={'community_slug': 'test-community'})
-        response = self.client.get(url)
+        # One COUNT for the paginator and one SELECT for the page
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
         
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
-        self.assertEqual(response.data[0]['title'], 'Test Post')
+        self.assertEqual(len(response.data['results']), 1)
+        self.assertEqual(response.data['results'][0]['title'], 'Test Post')
     
     def test_create_post(self):
         """Test creating a new post"""
@@ -204,12 +216,33 @@ class PostTests(APITestCase):
             'post_type': 'discussion'
         }
         
-        response = self.client.post(url, data, format='json')
+        # Community, membership check, INSERT and the new post's has_upvoted
+        with self.assertNumQueries(4):
+            response = self.client.post(url, data, format='json')
         
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
         self.assertEqual(Post.objects.count(), 2)
         self.assertEqual(Post.objects.get(title='New Test Post').content, 'This is a new test post')
     
+    def test_bulk_create_posts(self):
+        """Bulk creation validates once and inserts every post in one statement"""
+        post_data = [
+            {'title': f'Bulk Post {i}', 'content': f'Bulk post number {i}'}
+            for i in range(5)
+        ]
+        
+        request = APIRequestFactory().get('/')
+        request.user = self.user
+        
+        # Membership check and one INSERT
+        with self.assertNumQueries(2):
+            posts = PostService.bulk_create_posts(self.community, self.user, post_data)
+            data = PostSerializer(posts, many=True, context={'request': request}).data
+        
+        self.assertEqual(len(data), 5)
+        self.assertFalse(any(post['has_upvoted'] for post in data))
+        self.assertEqual(Post.objects.filter(title__startswith='Bulk Post').count(), 5)
+    
     def test_upvote_post(self):
         """Test upvoting a post"""
         url = reverse('community-posts-upvote', kwargs={
@@ -344,3 +377,178 @@ class CommentTests(APITestCase):
         self.assertEqual(Comment.objects.count(), 2)
         self.assertEqual(self.comment.replies.count(), 1)
         self.assertEqual(self.comment.replies.first().content, 'This is a reply to the test comment')
+
+
+class CommunityMembersQueryTests(APITestCase):
+    """Test that member listings don't issue a query per membership"""
+    
+    def setUp(self):
+        cache.clear()
+        
+        self.creator = User.objects.create_user(
+            email='creator@example.com',
+            username='creator',
+            first_name='Community',
+            last_name='Creator',
+            password='testpass123'
+        )
+        self.community = Community.objects.create(
+            name='Members Community',
+            slug='members-community',
+            description='A community with several members',
+            creator=self.creator
+        )
+        for i in range(5):
+            member = User.objects.create_user(
+                email=f'member{i}@example.com',
+                username=f'member{i}',
+                first_name='Member',
+                last_name=str(i),
+                password='testpass123'
+            )
+            Membership.objects.create(user=member, community=self.community, status='approved')
+        
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.creator)
+    
+    def test_debug_community_members_query_count(self):
+        """Community lookup plus one joined membership/user SELECT"""
+        url = reverse('debug-community-members', kwargs={'slug': 'members-community'})
+        
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'limit': 3, 'offset': 1})
+        
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        data = response.json()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(len(data['results']), 3)
+        self.assertIn('full_name', data['results'][0]['user'])
+
+
+class CacheCounterRebuildTests(TestCase):
+    """Test that counter rebuilds are aggregated UPDATEs, not a COUNT per row"""
+    
+    def setUp(self):
+        self.author = User.objects.create_user(
+            email='author@example.com',
+            username='author',
+            first_name='Post',
+            last_name='Author',
+            password='testpass123'
+        )
+        self.voters = [
+            User.objects.create_user(
+                email=f'voter{i}@example.com',
+                username=f'voter{i}',
+                first_name='Voter',
+                last_name=str(i),
+                password='testpass123'
+            )
+            for i in range(3)
+        ]
+        community = Community.objects.create(
+            name='Counter Community',
+            slug='counter-community',
+            description='A community for counter tests',
+            creator=self.author
+        )
+        self.post = Post.objects.create(
+            title='Counter Post',
+            content='Post with comments',
+            author=self.author,
+            community=community
+        )
+        self.comments = [
+            Comment.objects.create(post=self.post, author=self.author, content=f'Comment {i}')
+            for i in range(4)
+        ]
+        for i, comment in enumerate(self.comments):
+            comment.upvotes.add(*self.voters[:i])
+    
+    def test_comment_upvote_rebuild_is_one_update(self):
+        """Drifted comment counters are fixed by one UPDATE however many comments exist"""
+        Comment.objects.update(upvote_count_cache=99)
+        
+        with self.assertNumQueries(1):
+            updated = update_comment_upvote_counts()
+        
+        self.assertEqual(updated, len(self.comments))
+        counts = dict(Comment.objects.values_list('id', 'upvote_count_cache'))
+        for i, comment in enumerate(self.comments):
+            self.assertEqual(counts[comment.id], min(i, len(self.voters)))
+    
+    def test_post_counter_rebuild_is_one_update(self):
+        """Post upvote and comment counters are rebuilt together in one UPDATE"""
+        self.post.upvotes.add(*self.voters)
+        Post.objects.update(upvote_count_cache=0, comment_count_cache=0)
+        
+        with self.assertNumQueries(1):
+            update_post_counts()
+        
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.upvote_count_cache, len(self.voters))
+        self.assertEqual(self.post.comment_count_cache, len(self.comments))
+    
+    def test_reading_posts_never_writes_counters(self):
+        """GETs report the counter columns as stored and issue no writes"""
+        Post.objects.update(upvote_count_cache=7, comment_count_cache=9)
+        client = APIClient()
+        client.force_authenticate(user=self.author)
+        list_url = reverse('community-posts-list', kwargs={'community_slug': 'counter-community'})
+        detail_url = reverse('community-posts-detail', kwargs={'community_slug': 'counter-community', 'pk': self.post.pk})
+        
+        with CaptureQueriesContext(connection) as queries:
+            list_response = client.get(list_url)
+            detail_response = client.get(detail_url)
+        
+        self.assertEqual(list_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail_response.status_code, status.HTTP_200_OK)
+        self.assertEqual(detail_response.data['upvote_count'], 7)
+        self.assertEqual(detail_response.data['comment_count'], 9)
+        writes = [q['sql'] for q in queries.captured_queries
+                  if q['sql'].lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))]
+        self.assertEqual(writes, [])
+
+
+class MembershipCountSignalTests(TestCase):
+    """Test that member counts are recounted once per transaction, not per membership"""
+    
+    def setUp(self):
+        self.creator = User.objects.create_user(
+            email='owner@example.com',
+            username='owner',
+            first_name='Community',
+            last_name='Owner',
+            password='testpass123'
+        )
+        self.community = Community.objects.create(
+            name='Count Community',
+            slug='count-community',
+            description='A community for member count tests',
+            creator=self.creator
+        )
+        self.users = [
+            User.objects.create_user(
+                email=f'joiner{i}@example.com',
+                username=f'joiner{i}',
+                first_name='Joiner',
+                last_name=str(i),
+                password='testpass123'
+            )
+            for i in range(3)
+        ]
+    
+    def test_memberships_in_one_transaction_share_one_recount(self):
+        """Several memberships saved together issue a single community UPDATE at commit"""
+        with CaptureQueriesContext(connection) as queries:
+            with self.captureOnCommitCallbacks(execute=True):
+                with transaction.atomic():
+                    for user in self.users:
+                        Membership.objects.create(user=user, community=self.community, status='approved')
+        
+        updates = [q['sql'] for q in queries.captured_queries
+                   if q['sql'].lstrip().upper().startswith('UPDATE')
+                   and 'communities_community' in q['sql']]
+        self.assertEqual(len(updates), 1)
+        self.community.refresh_from_db()
+        self.assertEqual(self.community.member_count_cache, len(self.users))
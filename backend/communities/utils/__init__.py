@@ -4,6 +4,8 @@
 # Communities app utilities
 from .exception_handler import custom_exception_handler
 from .cache import cached_property, cached_method, cache_queryset, invalidate_model_cache
+from .responses import OrjsonResponse
+from .queries import count_subquery, sum_subquery
 
 __all__ = [
     'custom_exception_handler',
@@ -11,4 +13,7 @@ __all__ = [
     'cached_method',
     'cache_queryset',
     'invalidate_model_cache',
+    'OrjsonResponse',
+    'count_subquery',
+    'sum_subquery',
 ] 
\ No newline at end of file
@@ -1,7 +1,11 @@
+from collections import OrderedDict
+from copy import deepcopy
 from functools import wraps
 from django.core.cache import cache
 import hashlib
 import json
+import threading
+import time
 from django.contrib.auth.models import AnonymousUser
 
 """
@@ -13,6 +17,8 @@ Key features:
 - Cached method decorator for expensive method calls
 - Cached queryset decorator for optimizing database queries
 - Cache key generation with support for non-serializable objects (Users, etc.)
+- Revision counters so a write invalidates dependent entries with one INCR
+- A small per-process cache in front of Redis for cached_method results
 
 Important: When dealing with User objects in caching, the system converts them
 to a string representation with their ID to avoid JSON serialization issues.
@@ -95,9 +101,60 @@ def cached_property(timeout=300):
     return decorator
 
 
-def cached_method(timeout=300):
+class LocalTTLCache:
+    """Thread-safe per-process LRU whose entries expire after their own ttl"""
+    
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key, default=None):
+        """
+        Return a copy of the value for key, or default when it's missing or expired.
+        Entries are shared by every thread, so callers never get the stored object.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+        return deepcopy(value)
+    
+    def set(self, key, value, ttl):
+        # Store a copy so the caller that computed value can't mutate the entry
+        value = deepcopy(value)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# Seconds a cached_method result may be served from process memory. Rev bumps
+# from this process clear it at once; other processes' bumps are only seen
+# through Redis, so this bounds how stale a worker can be
+LOCAL_CACHE_TTL = 5
+
+_local_cache = LocalTTLCache()
+
+# Marks a local cache miss, so None results are cached like any other
+_MISSING = object()
+
+
+def cached_method(timeout=300, revs=None):
     """
     Decorator to cache results of instance or class methods.
+    revs, if given, is called with the method's arguments and returns the rev
+    keys the result depends on; bumping any of them invalidates the entry.
     
     Usage:
         @cached_method(timeout=3600)
@@ -114,17 +171,19 @@ def cached_method(timeout=300):
             else:
                 # For class methods or functions
                 key_prefix = f"cached_method:{func.__module__}:{func.__name__}"
+                # Static methods taking an id first must not share one key
+                if isinstance(self, (int, str)):
+                    key_prefix = f"{key_prefix}:{self}"
             
             # Generate a unique key for this method call
             key = generate_cache_key(key_prefix, *args, **kwargs)
             
-            # Try to get from cache
-            result = cache.get(key)
-            if result is None:
-                # If not in cache, compute and store
-                result = func(self, *args, **kwargs)
-                cache.set(key, result, timeout)
-            
+            # Repeat calls in this worker skip the Redis round trip
+            result = _local_cache.get(key, _MISSING)
+            if result is _MISSING:
+                rev_keys = revs(self, *args, **kwargs) if revs else ()
+                result = get_or_compute(key, rev_keys, lambda: func(self, *args, **kwargs), timeout)
+                _local_cache.set(key, result, min(timeout, LOCAL_CACHE_TTL))
             return result
         return wrapper
     return decorator
@@ -139,11 +198,12 @@ def invalidate_model_cache(instance):
     cache.delete_pattern(pattern)
 
 
-def cache_queryset(timeout=300):
+def cache_queryset(timeout=300, revs=None):
     """
     Decorator to cache results of a queryset-returning method.
     Note: This is only appropriate for read-only operations where
     stale data for a short time is acceptable.
+    revs works as for cached_method.
     """
     def decorator(func):
         @wraps(func)
@@ -157,13 +217,88 @@ def cache_queryset(timeout=300):
             
             key = generate_cache_key(key_prefix, *args, **kwargs)
             
-            # Try to get from cache
-            result = cache.get(key)
-            if result is None:
-                # If not in cache, compute and store
-                result = list(func(*args, **kwargs))  # Convert queryset to list
-                cache.set(key, result, timeout)
-            
-            return result
+            rev_keys = revs(*args, **kwargs) if revs else ()
+            # Convert queryset to list
+            return get_or_compute(key, rev_keys, lambda: list(func(*args, **kwargs)), timeout)
         return wrapper
-    return decorator 
\ No newline at end of file
+    return decorator
+
+
+def community_rev_key(community_id):
+    return f"rev:community:{community_id}"
+
+
+def user_rev_key(user_id):
+    return f"rev:user:{user_id}"
+
+
+# Bumped with every community rev, for results that span all communities
+COMMUNITY_LIST_REV_KEY = "rev:community:list"
+
+
+def bump_rev(key):
+    """
+    Advance a revision counter (INCR on Redis); entries stored under an older
+    rev are discarded on their next read. A missing counter restarts from the
+    clock so it can't land back on a value an old entry recorded.
+    """
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, int(time.time() * 1000), None)
+    # Local entries don't carry revs, so drop them all
+    _local_cache.clear()
+
+
+def bump_revs(keys):
+    """
+    Advance several revision counters in one round trip. On Redis each gets a
+    SET NX from the clock (for a missing counter) and an INCR in one pipeline.
+    """
+    redis_client = getattr(cache, 'client', None)
+    if not hasattr(redis_client, 'get_client'):
+        for key in keys:
+            bump_rev(key)
+        return
+    
+    now = int(time.time() * 1000)
+    pipeline = redis_client.get_client(write=True).pipeline()
+    for key in keys:
+        key = redis_client.make_key(key)
+        pipeline.set(key, now, nx=True)
+        pipeline.incr(key)
+    pipeline.execute()
+    _local_cache.clear()
+
+
+def bump_community_rev(community_id):
+    """Invalidate cached results that depend on community_id"""
+    bump_revs([community_rev_key(community_id), COMMUNITY_LIST_REV_KEY])
+
+
+def bump_user_rev(user_id):
+    """Invalidate cached results that depend on user_id"""
+    bump_rev(user_rev_key(user_id))
+
+
+def get_or_compute(key, rev_keys, compute, timeout):
+    """
+    Return the cached value for key, computing and storing it on a miss.
+    With rev_keys the entry is stored as (revs, payload) and the revs are read
+    in the same round trip; a mismatch means a dependency changed, so recompute.
+    """
+    if not rev_keys:
+        result = cache.get(key)
+        if result is None:
+            result = compute()
+            cache.set(key, result, timeout)
+        return result
+    
+    found = cache.get_many([key, *rev_keys])
+    current = tuple(found.get(rev_key) for rev_key in rev_keys)
+    entry = found.get(key)
+    if entry is not None and entry[0] == current:
+        return entry[1]
+    result = compute()
+    cache.set(key, (current, result), timeout)
+    return result
@@ -0,0 +1,19 @@
+from django.db import models
+from django.db.models import Count, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+
+
+def count_subquery(queryset, field):
+    """Correlated COUNT(*) of queryset rows whose field points at the outer row"""
+    counts = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Count('pk')
+    ).values('total')
+    return Coalesce(Subquery(counts, output_field=models.IntegerField()), Value(0))
+
+
+def sum_subquery(queryset, field, column):
+    """Correlated SUM(column) of queryset rows whose field points at the outer row"""
+    sums = queryset.filter(**{field: OuterRef('pk')}).order_by().values(field).annotate(
+        total=Sum(column)
+    ).values('total')
+    return Coalesce(Subquery(sums, output_field=models.IntegerField()), Value(0))
@@ -0,0 +1,12 @@
+import orjson
+from django.http import HttpResponse
+
+
+class OrjsonResponse(HttpResponse):
+    """
+    JSON response encoded with orjson.
+    Drop-in for JsonResponse on large payloads; naive datetimes are treated as UTC.
+    """
+    def __init__(self, data, **kwargs):
+        kwargs.setdefault('content_type', 'application/json')
+        super().__init__(orjson.dumps(data, option=orjson.OPT_NAIVE_UTC), **kwargs)
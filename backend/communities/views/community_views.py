@@ -7,6 +7,7 @@ from django.http import Http404
 
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
@@ -200,6 +201,9 @@ class CommunityViewSet(
             # Save the community - the serializer will handle setting the creator and creating membership
             try:
                 community = serializer.save()
+            except ValidationError as ve:
+                # The name was taken by a concurrent create after validation
+                return Response(ve.detail, status=status.HTTP_400_BAD_REQUEST)
             except IntegrityError as ie:
                 # Check if this is a duplicate membership error
                 if 'communities_membership_user_id_community_id' in str(ie):
@@ -375,15 +379,13 @@ class CommunityViewSet(
                 if offset + limit < total_count:
                     query_params['offset'] = offset + limit
                     query_params['limit'] = limit
-                    next_query = '&'.join([f"{k}={v}" for k, v in query_params.items()])
-                    response_data['next'] = f"{base_url}?{next_query}"
+                    response_data['next'] = f"{base_url}?{query_params.urlencode()}"
                 
                 # Previous page link
                 if offset - limit >= 0:
                     query_params['offset'] = max(0, offset - limit)
                     query_params['limit'] = limit
-                    prev_query = '&'.join([f"{k}={v}" for k, v in query_params.items()])
-                    response_data['previous'] = f"{base_url}?{prev_query}"
+                    response_data['previous'] = f"{base_url}?{query_params.urlencode()}"
             
             return Response(response_data)
         except Exception as e:
@@ -490,7 +492,7 @@ class CommunityViewSet(
         
         # Return comprehensive response
         return Response({
-            "detail": f"Processed {len(invitee_emails)} invitations. {success_count} sent successfully.",
+            "detail": f"Processed {len(invitee_emails)} invitations. {success_count} queued for sending.",
             "success_count": success_count,
             "failed_emails": failed_emails
         }, status=status.HTTP_207_MULTI_STATUS)
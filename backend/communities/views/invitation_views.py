@@ -225,7 +225,7 @@ class InvitationViews:
             
             # Cancel the invitation
             invitation.status = 'cancelled'
-            invitation.save()
+            invitation.save(update_fields=['status', 'updated_at'])
             
             return Response(
                 {"detail": "Invitation cancelled successfully."},
@@ -182,7 +182,7 @@ class MembershipViews:
         # Update the membership status
         if approve:
             membership.status = 'approved'
-            membership.save()
+            membership.save(update_fields=['status', 'updated_at'])
             return Response(
                 {"detail": "Membership approved successfully."},
                 status=status.HTTP_200_OK
@@ -156,7 +156,8 @@ class PostViewSet(viewsets.ModelViewSet):
             user=self.request.user,
             community_slug=self.kwargs.get('community_slug'),
             post_type=self.request.query_params.get('type'),
-            search=self.request.query_params.get('search')
+            search=self.request.query_params.get('search'),
+            with_comments=self.action == 'retrieve'
         )
     
     def create(self, request, *args, **kwargs):
@@ -385,17 +386,15 @@ class PostViewSet(viewsets.ModelViewSet):
         
         if request.user.is_authenticated:
             from ..models import Membership
-            try:
-                membership = Membership.objects.get(
-                    user=request.user,
-                    community=community,
-                    status='approved'
-                )
+            membership = Membership.objects.filter(
+                user=request.user,
+                community=community,
+                status='approved'
+            ).values('role', 'status').first()
+            if membership:
                 is_member = True
-                is_admin = membership.role == 'admin'
-                membership_status = membership.status
-            except Membership.DoesNotExist:
-                pass
+                is_admin = membership['role'] == 'admin'
+                membership_status = membership['status']
         
         # Get all posts in the community
         all_posts = Post.objects.filter(community=community)
@@ -454,17 +453,13 @@ class PostViewSet(viewsets.ModelViewSet):
             else:
                 # Get membership status
                 from ..models import Membership
-                try:
-                    membership = Membership.objects.get(
-                        user=user,
-                        community=community,
-                        status='approved'
-                    )
-                    is_member = True
-                    is_admin = membership.role == 'admin'
-                except Membership.DoesNotExist:
-                    is_member = False
-                    is_admin = False
+                role = Membership.objects.filter(
+                    user=user,
+                    community=community,
+                    status='approved'
+                ).values_list('role', flat=True).first()
+                is_member = role is not None
+                is_admin = role == 'admin'
                 
                 # User is not a member, only allow access to public posts in public communities
                 if not is_member:
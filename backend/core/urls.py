@@ -4,6 +4,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.static import serve
 import os
+import logging
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework.decorators import api_view
 from django.http import HttpResponse, JsonResponse
@@ -16,15 +17,19 @@ from communities.views import CommunityViewSet
 from communities.models import Community
 from communities.services.community_service import CommunityService
 
+logger = logging.getLogger(__name__)
+
 # Special view to debug API requests
 @api_view(['GET', 'POST', 'PUT', 'DELETE', 'PATCH', 'OPTIONS'])
 @csrf_exempt
 def debug_api(request, path):
-    print(f"DEBUG API: {request.method} request to {path}")
-    print(f"DEBUG API: Content type: {request.content_type}")
-    print(f"DEBUG API: Auth: {request.META.get('HTTP_AUTHORIZATION', 'No Auth')}")
-    print(f"DEBUG API: Body: {request.body[:1000] if request.body else 'No body'}")
-    print(f"DEBUG API: Data: {request.data}")
+    # Skip building the request dump entirely unless debug logging is on
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "Debug API: %s request to %s, content type %s, auth present %s, body %r",
+            request.method, path, request.content_type,
+            bool(request.META.get('HTTP_AUTHORIZATION')), request.body[:1000]
+        )
     
     return HttpResponse(
         f"Debug API ({request.method}): Path={path}, Auth Present={bool(request.META.get('HTTP_AUTHORIZATION'))}, Content-Type={request.content_type}",
@@ -36,7 +41,7 @@ def debug_api(request, path):
 @csrf_exempt
 def direct_join_community(request, slug):
     """Direct implementation of the join community endpoint"""
-    print(f"DIRECT JOIN: Request to join community with slug: {slug}")
+    logger.debug("Direct join: request to join community %s", slug)
     
     if not request.user.is_authenticated:
         return JsonResponse({
@@ -46,7 +51,7 @@ def direct_join_community(request, slug):
     try:
         # Get the community directly
         community = Community.objects.get(slug=slug)
-        print(f"DIRECT JOIN: Found community {community.name}")
+        logger.debug("Direct join: found community %s", community.name)
         
         # Use the service layer to join the community
         membership, message = CommunityService.join_community(request.user, community)
@@ -57,13 +62,13 @@ def direct_join_community(request, slug):
             return JsonResponse({"detail": message}, status=status.HTTP_400_BAD_REQUEST)
     
     except Community.DoesNotExist:
-        print(f"DIRECT JOIN: Community with slug '{slug}' not found")
+        logger.debug("Direct join: community %s not found", slug)
         return JsonResponse({
             "detail": f"Community with slug '{slug}' not found"
         }, status=status.HTTP_404_NOT_FOUND)
     
     except Exception as e:
-        print(f"DIRECT JOIN: Error joining community: {str(e)}")
+        logger.exception("Direct join: error joining community %s", slug)
         return JsonResponse({
             "detail": f"Error joining community: {str(e)}"
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser, BaseUserManager
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils.translation import gettext_lazy as _
 
 
@@ -82,6 +84,12 @@ class User(AbstractUser):
     class Meta:
         verbose_name = _("user")
         verbose_name_plural = _("users")
+        indexes = [
+            # Trigram indexes for the icontains user search. PostgreSQL compiles
+            # icontains to UPPER(col) LIKE UPPER(...), so index the same expression.
+            GinIndex(OpClass(Upper('username'), name='gin_trgm_ops'), name='users_username_trgm'),
+            GinIndex(OpClass(Upper('email'), name='gin_trgm_ops'), name='users_email_trgm'),
+        ]
     
     def __str__(self):
         return self.email
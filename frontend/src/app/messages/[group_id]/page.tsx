@@ -1,5 +1,5 @@
 "use client";
-import { useEffect, useState, useRef, useCallback } from "react";
+import { useEffect, useLayoutEffect, useState, useRef, useCallback } from "react";
 import { useParams } from "next/navigation";
 import { baseApi } from "@/services/api";
 import { useAuth } from "@/contexts/AuthContext";
@@ -23,6 +23,9 @@ const GroupMessagesPage = () => {
   const { isAuthenticated } = useAuth();
   const { user } = useUser();
   const [messages, setMessages] = useState<Message[]>([]);
+  // Cursor URL of the next older page of history, null once it is all loaded
+  const [olderPageUrl, setOlderPageUrl] = useState<string | null>(null);
+  const [loadingOlder, setLoadingOlder] = useState(false);
   const [groupInfo, setGroupInfo] = useState<GroupInfo | null>(null);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
@@ -37,6 +40,8 @@ const GroupMessagesPage = () => {
   const typingTimeoutRef = useRef<NodeJS.Timeout | null>(null);
   const messageContainerRef = useRef<HTMLDivElement>(null);
   const inputRef = useRef<HTMLInputElement>(null);
+  // scrollHeight before older messages were prepended, to keep the view in place
+  const prependScrollHeightRef = useRef<number | null>(null);
 
   // Improved debounced typing indicator to prevent excessive WebSocket messages
   const debouncedTypingRef = useRef<NodeJS.Timeout | null>(null);
@@ -69,7 +74,9 @@ const GroupMessagesPage = () => {
           baseApi.get(`/api/messages/`, { params: { group: group_id } }),
           baseApi.get(`/api/message-groups/${group_id}/`),
         ]);
-        setMessages(messagesRes.data);
+        // History is cursor-paginated; the first page holds the latest messages
+        setMessages(messagesRes.data.results);
+        setOlderPageUrl(messagesRes.data.next);
         setGroupInfo(groupInfoRes.data);
       } catch (err: any) {
         setError("Failed to load chat data.");
@@ -417,8 +424,37 @@ const GroupMessagesPage = () => {
     }, 300); // Debounce typing events by 300ms
   }, [group_id, user]);
 
-  // Scroll to latest message with improved handling
-  useEffect(() => {
+  // Fetch the next older page of history and prepend it
+  const loadOlderMessages = useCallback(async () => {
+    if (!olderPageUrl || loadingOlder) return;
+    setLoadingOlder(true);
+    try {
+      const res = await baseApi.get(olderPageUrl);
+      if (messageContainerRef.current) {
+        prependScrollHeightRef.current = messageContainerRef.current.scrollHeight;
+      }
+      setMessages((prev) => {
+        const seen = new Set(prev.map((m) => m.id));
+        const older = (res.data.results as Message[]).filter((m) => !seen.has(m.id));
+        return [...older, ...prev];
+      });
+      setOlderPageUrl(res.data.next);
+    } catch (err) {
+      console.error("Error fetching older messages:", err);
+    } finally {
+      setLoadingOlder(false);
+    }
+  }, [olderPageUrl, loadingOlder]);
+
+  // Scroll to latest message with improved handling; after prepending older
+  // messages keep the view on the message that was at the top instead
+  useLayoutEffect(() => {
+    const container = messageContainerRef.current;
+    if (prependScrollHeightRef.current !== null && container) {
+      container.scrollTop += container.scrollHeight - prependScrollHeightRef.current;
+      prependScrollHeightRef.current = null;
+      return;
+    }
     if (messagesEndRef.current) {
       messagesEndRef.current.scrollIntoView({ behavior: "smooth" });
     }
@@ -676,6 +712,17 @@ const GroupMessagesPage = () => {
           </div>
         ) : (
           <>
+            {olderPageUrl && (
+              <div className="flex justify-center">
+                <button
+                  onClick={loadOlderMessages}
+                  disabled={loadingOlder}
+                  className="text-sm font-medium text-blue-600 hover:underline disabled:text-gray-400 disabled:no-underline"
+                >
+                  {loadingOlder ? "Loading..." : "Load older messages"}
+                </button>
+              </div>
+            )}
             {Object.entries(groupedMessages).map(([date, dateMessages]) => (
               <div key={date} className="space-y-4">
                 <div className="flex items-center">